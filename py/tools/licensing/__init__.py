@@ -0,0 +1,134 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""License compliance tooling for the Genkit workspace.
+
+Detects the license of every workspace package from its manifest
+(``pyproject.toml``, ``package.json``, ``pom.xml``) or license file, and
+falls back to registry lookups for packages whose manifests do not declare
+one.
+"""
+
+from ._license_detect import (
+    PackageInfo,
+    detect_license,
+    detect_license_with_lookup,
+    discover_packages,
+)
+from ._license_fetch import (
+    LicenseFetchRequest,
+    LicenseLookupCache,
+    fetch_license_texts,
+    lookup_licenses,
+)
+from ._license_fix import (
+    FixAction,
+    LicenseFixChoice,
+    LicenseFixReport,
+    apply_fixes,
+    collect_fixable_deps,
+    count_fixable_deps,
+    interactive_license_fix,
+    iter_fixable_deps,
+    prompt_for_fix,
+)
+from ._license_graph import (
+    LicenseGraph,
+    LicenseGraphError,
+    LicenseId,
+    LicenseInfo,
+    LicenseRef,
+)
+from ._license_resolver import LicenseResolver, ResolvedLicense
+from ._license_tree import (
+    LICENSE_TREE_FORMATS,
+    DepNode,
+    DepStatus,
+    LockEntry,
+    LockGraph,
+    PackageTree,
+    all_transitive_external_deps,
+    build_closures,
+    format_license_diagnostic,
+    format_license_tree,
+    format_license_tree_as,
+    license_tree_to_d2,
+    license_tree_to_dot,
+    license_tree_to_json,
+    license_tree_to_mermaid,
+    license_tree_to_table,
+    parse_uv_lock,
+    registry_url_for,
+    transitive_deps,
+)
+from ._preflight import (
+    PreflightResult,
+    detect_cycles,
+    fix_missing_license_files,
+    fix_stale_artifacts,
+    run_preflight,
+)
+
+__all__ = [
+    'DepNode',
+    'DepStatus',
+    'FixAction',
+    'LicenseFetchRequest',
+    'LicenseFixChoice',
+    'LicenseFixReport',
+    'LicenseGraph',
+    'LicenseGraphError',
+    'LicenseId',
+    'LicenseInfo',
+    'LicenseLookupCache',
+    'LicenseRef',
+    'LockEntry',
+    'LockGraph',
+    'LicenseResolver',
+    'PackageInfo',
+    'PackageTree',
+    'PreflightResult',
+    'ResolvedLicense',
+    'all_transitive_external_deps',
+    'build_closures',
+    'apply_fixes',
+    'collect_fixable_deps',
+    'count_fixable_deps',
+    'detect_cycles',
+    'detect_license',
+    'detect_license_with_lookup',
+    'discover_packages',
+    'fetch_license_texts',
+    'fix_missing_license_files',
+    'fix_stale_artifacts',
+    'format_license_diagnostic',
+    'LICENSE_TREE_FORMATS',
+    'format_license_tree',
+    'format_license_tree_as',
+    'interactive_license_fix',
+    'iter_fixable_deps',
+    'license_tree_to_d2',
+    'license_tree_to_dot',
+    'license_tree_to_json',
+    'license_tree_to_mermaid',
+    'license_tree_to_table',
+    'lookup_licenses',
+    'parse_uv_lock',
+    'prompt_for_fix',
+    'registry_url_for',
+    'run_preflight',
+    'transitive_deps',
+]
@@ -0,0 +1,235 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Local license detection for workspace packages.
+
+Each detector inspects one manifest format and returns the declared license
+string (ideally an SPDX identifier) or ``None`` when the manifest is absent
+or silent about licensing.
+"""
+
+import json
+import xml.etree.ElementTree as ET  # noqa: S405 - parses local manifests only.
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+import tomllib
+
+if TYPE_CHECKING:
+    from ._license_fetch import LicenseLookupCache
+
+# Filenames a license text commonly lives under, in preference order.
+# Shared with _license_fetch so both sides probe the same names.
+_LICENSE_FILENAMES: Final = ('LICENSE', 'LICENSE.md', 'LICENSE.txt', 'LICENCE', 'COPYING')
+
+# Trove classifier -> SPDX identifier, for pyproject files that only declare
+# a license via classifiers.
+_CLASSIFIER_SPDX = {
+    'License :: OSI Approved :: Apache Software License': 'Apache-2.0',
+    'License :: OSI Approved :: BSD License': 'BSD-3-Clause',
+    'License :: OSI Approved :: GNU General Public License v3 (GPLv3)': 'GPL-3.0-only',
+    'License :: OSI Approved :: ISC License (ISCL)': 'ISC',
+    'License :: OSI Approved :: MIT License': 'MIT',
+    'License :: OSI Approved :: Mozilla Public License 2.0 (MPL 2.0)': 'MPL-2.0',
+}
+
+# (needle found in license text, SPDX identifier) pairs, checked in order.
+_KEYWORD_SPDX = (
+    ('Apache License', 'Apache-2.0'),
+    ('MIT License', 'MIT'),
+    ('BSD 3-Clause', 'BSD-3-Clause'),
+    ('BSD 2-Clause', 'BSD-2-Clause'),
+    ('GNU LESSER GENERAL PUBLIC LICENSE', 'LGPL-3.0-or-later'),
+    ('GNU GENERAL PUBLIC LICENSE', 'GPL-3.0-or-later'),
+    ('Mozilla Public License', 'MPL-2.0'),
+    ('ISC License', 'ISC'),
+)
+
+
+@dataclass
+class PackageInfo:
+    """A package directory the detector can inspect."""
+
+    name: str
+    path: Path
+    version: str = ''
+    license: str | None = field(default=None, compare=False)
+
+
+def discover_packages(root: Path) -> list[PackageInfo]:
+    """Find workspace packages under ``root`` (one level deep)."""
+    packages = []
+    for child in sorted(root.iterdir()):
+        if not child.is_dir() or child.name.startswith('.'):
+            continue
+        if any((child / manifest).is_file() for manifest in ('pyproject.toml', 'package.json', 'pom.xml')):
+            packages.append(PackageInfo(name=child.name, path=child))
+    return packages
+
+
+def _detect_python(pkg_dir: Path) -> str | None:
+    """Read the declared license from ``pyproject.toml``."""
+    pyproject = pkg_dir / 'pyproject.toml'
+    if not pyproject.is_file():
+        return None
+    try:
+        data = tomllib.loads(pyproject.read_text(encoding='utf-8'))
+    except (tomllib.TOMLDecodeError, OSError):
+        return None
+    project = data.get('project', {})
+    declared = project.get('license')
+    if isinstance(declared, str) and declared:
+        return declared
+    if isinstance(declared, dict):
+        text = declared.get('text')
+        if isinstance(text, str) and text:
+            return text
+    for classifier in project.get('classifiers', []):
+        if classifier in _CLASSIFIER_SPDX:
+            return _CLASSIFIER_SPDX[classifier]
+    return None
+
+
+def _detect_node(pkg_dir: Path) -> str | None:
+    """Read the ``license`` field from ``package.json``."""
+    manifest = pkg_dir / 'package.json'
+    if not manifest.is_file():
+        return None
+    try:
+        data = json.loads(manifest.read_text(encoding='utf-8'))
+    except (json.JSONDecodeError, OSError):
+        return None
+    declared = data.get('license')
+    if isinstance(declared, str) and declared:
+        return declared
+    # Legacy {"type": ..., "url": ...} shape.
+    if isinstance(declared, dict):
+        kind = declared.get('type')
+        if isinstance(kind, str) and kind:
+            return kind
+    return None
+
+
+def _detect_java(pkg_dir: Path) -> str | None:
+    """Read the first ``<licenses><license><name>`` from ``pom.xml``.
+
+    Streams the pom with ``iterparse`` instead of materializing the whole
+    DOM: large Maven poms carry hundreds of dependency elements we never
+    look at, and we only need the first license name.
+    """
+    pom = pkg_dir / 'pom.xml'
+    if not pom.is_file():
+        return None
+    # pom namespaces vary; match on the tag's local name only.
+    in_licenses = False
+    in_license = False
+    try:
+        for event, elem in ET.iterparse(pom, events=('start', 'end')):  # noqa: S314
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                if tag == 'licenses':
+                    in_licenses = True
+                elif tag == 'license' and in_licenses:
+                    in_license = True
+                continue
+            if tag == 'name' and in_license and elem.text:
+                return elem.text.strip()
+            if tag == 'license':
+                in_license = False
+            elif tag == 'licenses':
+                in_licenses = False
+            elem.clear()
+    except ET.ParseError:
+        return None
+    return None
+
+
+def _detect_license_file(pkg_dir: Path) -> str | None:
+    """Infer the license from a LICENSE-style file's opening text."""
+    for name in _LICENSE_FILENAMES:
+        candidate = pkg_dir / name
+        if not candidate.is_file():
+            continue
+        try:
+            head = candidate.read_text(encoding='utf-8', errors='replace')[:4096]
+        except OSError:
+            continue
+        for needle, spdx in _KEYWORD_SPDX:
+            if needle.casefold() in head.casefold():
+                return spdx
+    return None
+
+
+def detect_license(pkg: PackageInfo) -> str | None:
+    """Detect the license of a single package from local files only."""
+    for detector in (_detect_python, _detect_node, _detect_java, _detect_license_file):
+        detected = detector(pkg.path)
+        if detected:
+            return detected
+    return None
+
+
+async def detect_license_with_lookup(
+    packages: list[PackageInfo],
+    cache: 'LicenseLookupCache | None' = None,
+    concurrency: int = 8,
+) -> dict[str, str | None]:
+    """Detect licenses locally, then look up the stragglers remotely.
+
+    Args:
+        packages: Packages to resolve.
+        cache: Optional ``LicenseLookupCache`` shared with the fetch layer.
+        concurrency: Maximum simultaneous registry requests.
+
+    Returns:
+        Mapping of package name to detected license (or ``None``).
+    """
+    from ._license_fetch import LicenseFetchRequest, lookup_licenses
+
+    # Resolve each package's identity exactly once up front; the getattr
+    # fallbacks (and the throwaway Path() they allocate) are not worth
+    # repeating per phase.
+    pkg_infos = [
+        (pkg, getattr(pkg, 'name', '') or Path(getattr(pkg, 'path', '.')).name, getattr(pkg, 'version', ''))
+        for pkg in packages
+    ]
+
+    results: dict[str, str | None] = {}
+    unknown: list[tuple[PackageInfo, str, str]] = []
+    for pkg, pkg_name, version in pkg_infos:
+        detected = detect_license(pkg)
+        if detected:
+            results[pkg_name] = detected
+        else:
+            unknown.append((pkg, pkg_name, version))
+
+    if unknown:
+        requests = []
+        for pkg, pkg_name, version in unknown:
+            ecosystem = 'pypi'
+            if (pkg.path / 'package.json').is_file():
+                ecosystem = 'npm'
+            elif (pkg.path / 'pom.xml').is_file():
+                ecosystem = 'maven'
+            requests.append(LicenseFetchRequest(name=pkg_name, ecosystem=ecosystem, version=version))
+        looked_up = await lookup_licenses(requests, cache=cache, concurrency=concurrency)
+        for _, pkg_name, _ in unknown:
+            results[pkg_name] = looked_up.get(pkg_name)
+        if cache is not None:
+            cache.flush()
+
+    return results
@@ -0,0 +1,566 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Registry license lookups and license-text fetching.
+
+Complements :mod:`._license_detect`: when a package's local manifests do not
+declare a license, we ask the package's registry (PyPI, npm, Maven Central)
+and optionally pull the full license text from GitHub. Results are cached on
+disk so repeated runs stay fast and offline-friendly.
+"""
+
+import asyncio
+import atexit
+import contextlib
+import functools
+import io
+import json
+import os
+import time
+import weakref
+import xml.etree.ElementTree as ET  # noqa: S405 - POMs come from Maven Central.
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment.
+    orjson = None
+
+from ._license_detect import _LICENSE_FILENAMES
+
+_PYPI_JSON_URL = 'https://pypi.org/pypi/{name}/json'
+_NPM_REGISTRY_URL = 'https://registry.npmjs.org/{name}'
+_MAVEN_POM_URL = 'https://repo1.maven.org/maven2/{group_path}/{artifact}/{version}/{artifact}-{version}.pom'
+_GITHUB_RAW_URL = 'https://raw.githubusercontent.com/{repo}/HEAD/{filename}'
+
+_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+_CLASSIFIER_OSI = 'License :: OSI Approved :: '
+_CLASSIFIER_ANY = 'License :: '
+
+# Registry replies can run to 100 KB+; orjson parses them several times
+# faster than the stdlib decoder behind httpx's resp.json(). It is an
+# optional speedup: environments without it fall back to the stdlib codec.
+if orjson is not None:
+    _parse_json = orjson.loads
+    _dump_json = orjson.dumps
+else:
+    _parse_json = json.loads
+
+    def _dump_json(obj: object) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+# Cache rows are flat 3-slot lists instead of dicts, so the key strings
+# are not repeated per entry on disk. Slot 0 holds ``False`` while no
+# lookup has recorded a license yet (``None`` means "looked up, none").
+_ROW_LICENSE = 0
+_ROW_SOURCE_URL = 1
+_ROW_TS = 2
+# Optional fourth slot: per-entry TTL override, used for negative results.
+_ROW_TTL = 3
+
+
+@dataclass
+class LicenseFetchRequest:
+    """One registry lookup: which package, on which registry."""
+
+    name: str
+    ecosystem: str = 'pypi'
+    version: str = ''
+    repo_url: str = ''
+
+
+def _row_from_dict(entry: dict) -> list:
+    """Convert a dict-shaped cache entry from older formats to a row."""
+    return [
+        entry['license'] if 'license' in entry else False,
+        entry.get('source_url', ''),
+        entry.get('ts', 0.0),
+    ]
+
+
+_LIVE_CACHES: 'weakref.WeakSet[LicenseLookupCache]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_caches() -> None:
+    """Persist dirty caches on abnormal exits.
+
+    One weakref-based hook for the whole process: registering a bound
+    method per instance would pin every cache alive until shutdown.
+    Caches whose directory is gone (tmp trees already torn down) are
+    skipped instead of silently recreated mid-exit.
+    """
+    for cache in list(_LIVE_CACHES):
+        if cache._path.parent.is_dir():
+            cache.flush()
+
+
+class LicenseLookupCache:
+    """JSON-backed cache of registry lookup results, keyed by package name."""
+
+    def __init__(self, path: Path, negative_ttl: int | None = 3600) -> None:
+        """Load the cache file at ``path``, tolerating a missing or bad file.
+
+        Args:
+            path: Location of the JSON Lines cache log.
+            negative_ttl: How long to cache "no license found" results, in
+                seconds, so transient registry outages retry soon. ``None``
+                skips caching them entirely.
+        """
+        self._path = path
+        self._negative_ttl = negative_ttl
+        self._data: dict[str, list] = {}
+        self._dirty_keys: set[str] = set()
+        self._lines_on_disk = 0
+        self._legacy_format = False
+        self._last_flush = time.monotonic()
+        try:
+            text = path.read_text(encoding='utf-8')
+        except OSError:
+            text = ''
+        if text:
+            self._load(text)
+        # Abnormal exits still persist whatever the run learned; the
+        # weakref hook lets abandoned caches be collected normally.
+        _LIVE_CACHES.add(self)
+
+    def _load(self, text: str) -> None:
+        """Parse the JSON Lines log; later records win over earlier ones."""
+        try:
+            whole = json.loads(text)
+        except json.JSONDecodeError:
+            whole = None
+        # A single-record log also parses as one dict; only a dict that is
+        # not shaped like a log record is the pre-log format.
+        if isinstance(whole, dict) and whole.keys() != {'key', 'entry'}:
+            # Pre-log single-dict format; rewritten as a log on next flush.
+            self._data = {k: _row_from_dict(v) for k, v in whole.items() if isinstance(v, dict)}
+            self._legacy_format = True
+            return
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            self._lines_on_disk += 1
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Torn tail line from an interrupted append.
+            key = record.get('key')
+            entry = record.get('entry')
+            if not isinstance(key, str):
+                continue
+            if isinstance(entry, list) and len(entry) in (3, 4):
+                self._data[key] = entry
+            elif isinstance(entry, dict):  # Older dict-shaped log lines.
+                self._data[key] = _row_from_dict(entry)
+
+    def get(self, key: str) -> list | None:
+        """Return the cached row for ``key`` if present and fresh.
+
+        Rows are ``[license, source_url, ts]``; index with the module's
+        ``_ROW_*`` constants.
+        """
+        row = self._data.get(key)
+        if row is None:
+            return None
+        ttl = row[_ROW_TTL] if len(row) > _ROW_TTL else _CACHE_TTL_SECONDS
+        if time.time() - row[_ROW_TS] > ttl:
+            return None
+        return row
+
+    def set_license(self, key: str, spdx: str | None) -> None:
+        """Record the looked-up license for ``key``.
+
+        Empty results are the common case on workspaces with internal
+        packages; persisting them all for the full TTL would bloat the log,
+        so they are written under ``negative_ttl`` (or skipped outright).
+        """
+        if spdx is None and self._negative_ttl is None:
+            return
+        row = self._data.get(key)
+        if row is None:
+            row = self._data[key] = [False, '', 0.0]
+        row[_ROW_LICENSE] = spdx
+        row[_ROW_TS] = time.time()
+        if spdx is None:
+            if len(row) > _ROW_TTL:
+                row[_ROW_TTL] = self._negative_ttl
+            else:
+                row.append(self._negative_ttl)
+        elif len(row) > _ROW_TTL:
+            del row[_ROW_TTL:]
+        self._dirty_keys.add(key)
+
+    def set_source_url(self, key: str, url: str) -> None:
+        """Record where the license text for ``key`` was fetched from."""
+        row = self._data.get(key)
+        if row is None:
+            row = self._data[key] = [False, '', 0.0]
+        row[_ROW_SOURCE_URL] = url
+        row[_ROW_TS] = time.time()
+        self._dirty_keys.add(key)
+
+    def close(self) -> None:
+        """Flush pending entries and detach from the exit hook.
+
+        After this the interpreter shutdown path will never touch the
+        cache's directory again — callers writing under a temporary tree
+        should close before tearing the tree down.
+        """
+        self.flush()
+        _LIVE_CACHES.discard(self)
+
+    def flush(self) -> None:
+        """Append entries changed since the last flush to the on-disk log.
+
+        The file is JSON Lines, one ``{"key", "entry"}`` record per line,
+        with last-writer-wins on load — so a flush writes bytes
+        proportional to the delta, not the whole cache. When the log grows
+        past twice the live entry count it is compacted in place.
+        """
+        if not self._dirty_keys:
+            return
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        if self._legacy_format:
+            # One-time rewrite from the old whole-dict format.
+            self._dirty_keys.clear()
+            self._legacy_format = False
+            self.compact()
+            self._last_flush = time.monotonic()
+            return
+        payload = b''.join(_dump_json({'key': key, 'entry': self._data[key]}) + b'\n' for key in self._dirty_keys)
+        with open(self._path, 'ab') as f:
+            f.write(payload)
+        self._lines_on_disk += len(self._dirty_keys)
+        self._dirty_keys.clear()
+        self._last_flush = time.monotonic()
+        if self._lines_on_disk > 2 * len(self._data):
+            self.compact()
+
+    def dump_pretty(self) -> str:
+        """Human-readable view of the live entries (the log stays compact)."""
+        return json.dumps(self._data, indent=2, sort_keys=True)
+
+    def compact(self) -> None:
+        """Rewrite the log with one line per live entry, atomically."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._path.with_suffix(self._path.suffix + '.tmp')
+        # fsync before the rename: os.replace is atomic, but without the
+        # sync a crash could still surface an empty renamed file. The cost
+        # is paid once per compaction, not per entry.
+        with open(tmp, 'wb') as f:
+            f.write(b''.join(_dump_json({'key': k, 'entry': e}) + b'\n' for k, e in self._data.items()))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
+        self._lines_on_disk = len(self._data)
+
+    def maybe_flush(self, interval: float = 5.0) -> None:
+        """Flush if dirty and at least ``interval`` seconds since the last write.
+
+        Long batch runs call this after each put so progress survives an
+        interrupt without reintroducing a write per lookup.
+        """
+        if self._dirty_keys and time.monotonic() - self._last_flush >= interval:
+            self.flush()
+
+
+def extract_license_from_pypi_json(info: dict) -> str | None:
+    """Pull a license string out of a PyPI JSON ``info`` block."""
+    declared = info.get('license')
+    # EAFP: declared is a short string on the overwhelming majority of
+    # real responses, so try the string ops and let the rare non-string
+    # fall through instead of type-checking every call.
+    try:
+        declared = declared.strip()
+    except AttributeError:
+        declared = ''
+    if declared and len(declared) < 120:
+        return declared
+    # One pass over the classifiers: an OSI-approved entry wins outright;
+    # otherwise the first bare ``License ::`` entry is remembered.
+    fallback = None
+    try:
+        for classifier in info.get('classifiers') or ():
+            if classifier.startswith(_CLASSIFIER_OSI):
+                return classifier.rsplit(' :: ', 1)[-1]
+            if fallback is None and classifier.startswith(_CLASSIFIER_ANY):
+                fallback = classifier.rsplit(' :: ', 1)[-1]
+    except (AttributeError, TypeError):
+        return fallback
+    return fallback
+
+
+async def _lookup_pypi(client: httpx.AsyncClient, req: LicenseFetchRequest) -> str | None:
+    """Look up a package's license on PyPI."""
+    resp = await client.get(_PYPI_JSON_URL.format(name=req.name))
+    if resp.status_code != 200:
+        return None
+    # A 200 with a non-JSON body (registry error pages) degrades to "no
+    # license", same as the Maven path does for broken POMs. Both JSON
+    # decoders raise ValueError subclasses.
+    try:
+        info = _parse_json(resp.content).get('info', {})
+    except (ValueError, AttributeError):  # Non-JSON body or non-object JSON.
+        return None
+    return extract_license_from_pypi_json(info)
+
+
+async def _lookup_npm(client: httpx.AsyncClient, req: LicenseFetchRequest) -> str | None:
+    """Look up a package's license on the npm registry."""
+    resp = await client.get(_NPM_REGISTRY_URL.format(name=req.name))
+    if resp.status_code != 200:
+        return None
+    try:
+        declared = _parse_json(resp.content).get('license')
+    except (ValueError, AttributeError):  # Non-JSON body or non-object JSON.
+        return None
+    if isinstance(declared, str) and declared:
+        return declared
+    if isinstance(declared, dict):
+        kind = declared.get('type')
+        if isinstance(kind, str) and kind:
+            return kind
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _xml_local_name(tag: str) -> str:
+    """Strip the ``{namespace}`` prefix from a qualified tag, with a cache.
+
+    ElementTree interns tag strings, so after the first element of each
+    kind this is a dict hit instead of a per-element rsplit + slice.
+    """
+    return tag.rsplit('}', 1)[-1]
+
+
+async def _lookup_maven_central(client: httpx.AsyncClient, req: LicenseFetchRequest) -> str | None:
+    """Look up an artifact's license from its pom on Maven Central."""
+    if ':' not in req.name or not req.version:
+        return None
+    group, artifact = req.name.split(':', 1)
+    url = _MAVEN_POM_URL.format(group_path=group.replace('.', '/'), artifact=artifact, version=req.version)
+    resp = await client.get(url)
+    if resp.status_code != 200:
+        return None
+    # Stream-parse and stop at the first <licenses><license><name>; POMs
+    # can be tens of KB and the license block sits near the top, so this
+    # skips building (and walking) the full tree.
+    in_licenses = in_license = False
+    try:
+        for event, elem in ET.iterparse(io.BytesIO(resp.content), events=('start', 'end')):  # noqa: S314
+            tag = _xml_local_name(elem.tag)
+            if event == 'start':
+                if tag == 'licenses':
+                    in_licenses = True
+                elif tag == 'license' and in_licenses:
+                    in_license = True
+                continue
+            if tag == 'name' and in_license and elem.text:
+                return elem.text.strip()
+            if tag == 'license':
+                in_license = False
+            elif tag == 'licenses':
+                return None
+            elem.clear()
+    except ET.ParseError:
+        return None
+    return None
+
+
+_LOOKUPS = {
+    'pypi': _lookup_pypi,
+    'npm': _lookup_npm,
+    'maven': _lookup_maven_central,
+}
+
+
+@contextlib.asynccontextmanager
+async def _shared_client(client: httpx.AsyncClient | None, concurrency: int) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield ``client`` as-is, or create (and later close) one sized for the batch."""
+    if client is not None:
+        yield client
+        return
+    limits = httpx.Limits(max_connections=max(concurrency, 8))
+    async with httpx.AsyncClient(timeout=20.0, follow_redirects=True, limits=limits) as owned:
+        yield owned
+
+
+async def _fetch_github_license(client: httpx.AsyncClient, repo: str) -> tuple[str, str] | None:
+    """Fetch raw license text from a GitHub repo, trying common filenames.
+
+    Returns:
+        ``(text, url)`` for the first filename that exists, else ``None``.
+    """
+    for filename in _LICENSE_FILENAMES:
+        url = _GITHUB_RAW_URL.format(repo=repo, filename=filename)
+        resp = await client.get(url)
+        if resp.status_code == 200 and resp.text:
+            return resp.text, url
+    return None
+
+
+async def lookup_licenses(
+    requests: list[LicenseFetchRequest],
+    cache: LicenseLookupCache | None = None,
+    concurrency: int = 8,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, str | None]:
+    """Look up licenses for ``requests`` on their registries, concurrently.
+
+    Args:
+        requests: Lookups to perform.
+        cache: Optional cache consulted before and updated after each lookup.
+        concurrency: Maximum simultaneous registry requests.
+        client: Optional shared HTTP client; one is created (and closed)
+            here if not given.
+
+    Returns:
+        Mapping of package name to license string (or ``None``), in
+        input order.
+    """
+    # Each coroutine writes its own pre-allocated slot; the final dict is
+    # built in one C-level pass, sized up front, and its iteration order
+    # deterministically follows the input regardless of completion order.
+    slots: list[tuple[str, str | None] | None] = [None] * len(requests)
+    # Per-ecosystem gates so slow registries (Maven POM downloads) cannot
+    # starve fast ones, plus a global cap bounding total open sockets.
+    sems = {eco: asyncio.Semaphore(concurrency) for eco in _LOOKUPS}
+    global_cap = asyncio.Semaphore(concurrency * 2)
+    # Coalesce identical lookups fired within the batch (the same transitive
+    # dep often appears under several sub-projects).
+    in_flight: dict[str, asyncio.Future[str | None]] = {}
+
+    # One client for the whole batch: connection pools, DNS, and TLS
+    # handshakes are per-host setup costs we pay once, not per lookup. The
+    # pool is sized to the global cap — the per-ecosystem semaphores admit
+    # up to twice ``concurrency`` in total — so it never gates parallelism
+    # itself.
+    async with _shared_client(client, concurrency * 2) as client:
+
+        async def _do_one(idx: int, req: LicenseFetchRequest) -> None:
+            if cache is not None:
+                row = cache.get(req.name)
+                if row is not None and row[_ROW_LICENSE] is not False:
+                    slots[idx] = (req.name, row[_ROW_LICENSE])
+                    return
+            lookup = _LOOKUPS.get(req.ecosystem)
+            if lookup is None:
+                slots[idx] = (req.name, None)
+                return
+            key = f'{req.ecosystem}:{req.name}:{req.version}'
+            existing = in_flight.get(key)
+            if existing is not None:
+                slots[idx] = (req.name, await existing)
+                return
+            fut: asyncio.Future[str | None] = asyncio.get_running_loop().create_future()
+            in_flight[key] = fut
+            try:
+                async with sems[req.ecosystem], global_cap:
+                    try:
+                        spdx = await lookup(client, req)
+                    except httpx.HTTPError:
+                        spdx = None
+            except BaseException:
+                fut.cancel()
+                raise
+            fut.set_result(spdx)
+            slots[idx] = (req.name, spdx)
+            if cache is not None:
+                cache.set_license(req.name, spdx)
+                cache.maybe_flush()
+
+        try:
+            await asyncio.gather(*[_do_one(i, req) for i, req in enumerate(requests)])
+        finally:
+            if cache is not None:
+                cache.flush()
+
+    return dict(slots)  # type: ignore[arg-type]
+
+
+async def fetch_license_texts(
+    requests: list[LicenseFetchRequest],
+    dest_dir: Path,
+    cache: LicenseLookupCache | None = None,
+    concurrency: int = 8,
+    client: httpx.AsyncClient | None = None,
+) -> dict[str, Path | None]:
+    """Download full license texts into ``dest_dir``, one file per package.
+
+    Args:
+        requests: Packages whose ``repo_url`` points at a GitHub repo.
+        dest_dir: Directory receiving ``<name>.LICENSE`` files.
+        cache: Optional cache updated with each text's source URL.
+        concurrency: Maximum simultaneous downloads.
+        client: Optional shared HTTP client; one is created (and closed)
+            here if not given.
+
+    Returns:
+        Mapping of package name to the written file (or ``None`` on miss).
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)  # noqa: ASYNC240 - one mkdir before the downloads start.
+    results: dict[str, Path | None] = {}
+
+    # Worker pool over a queue rather than gather(*[...]): only
+    # `concurrency` tasks ever exist, instead of one per request, and the
+    # queue structurally bounds concurrency so no semaphore is needed.
+    queue: asyncio.Queue[LicenseFetchRequest] = asyncio.Queue()
+    for req in requests:
+        queue.put_nowait(req)
+
+    async with _shared_client(client, concurrency) as client:
+
+        async def _do_one(req: LicenseFetchRequest) -> None:
+            repo = req.repo_url.removeprefix('https://github.com/').strip('/')
+            if not repo:
+                results[req.name] = None
+                return
+            try:
+                fetched = await _fetch_github_license(client, repo)
+            except httpx.HTTPError:
+                fetched = None
+            if fetched is None:
+                results[req.name] = None
+                return
+            text, url = fetched
+            out = dest_dir / f'{req.name.replace("/", "_")}.LICENSE'
+            out.write_text(text, encoding='utf-8')
+            results[req.name] = out
+            if cache is not None:
+                cache.set_source_url(req.name, url)
+
+        async def _worker() -> None:
+            while True:
+                try:
+                    req = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await _do_one(req)
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(min(concurrency, len(requests))):
+                tg.create_task(_worker())
+
+    if cache is not None:
+        cache.flush()
+    return results
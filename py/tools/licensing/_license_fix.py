@@ -0,0 +1,633 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Interactive fixing of license findings.
+
+Walks the dependency tree, prompts for a resolution for every dependency
+whose license is missing, denied or incompatible, and writes the chosen
+exemptions/allowances into the ``[licenses]`` section of ``releasekit.toml``
+(comments and formatting preserved via tomlkit).
+"""
+
+import copy
+import functools
+import io
+import os
+import re
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from enum import Enum
+from itertools import groupby
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import tomllib
+
+if TYPE_CHECKING:
+    import tomlkit
+    import tomlkit.items
+
+from ._license_tree import DepNode, DepStatus, PackageTree
+
+_BOLD_RED = '\033[1;31m'
+_YELLOW = '\033[1;33m'
+_GREEN = '\033[0;32m'
+_RESET = '\033[0m'
+
+_FIXABLE_STATUSES = frozenset({
+    DepStatus.INCOMPATIBLE,
+    DepStatus.DENIED,
+    DepStatus.NO_LICENSE,
+    DepStatus.UNRESOLVED,
+})
+
+_MENU = """\
+  {dep_name} ({license})
+    [1] exempt package
+    [2] allow license everywhere
+    [3] deny license everywhere
+    [4] override license
+    [5] skip
+"""
+
+_PROMPT = '  choice [1-5]: '
+
+
+class FixAction(Enum):
+    """What the user chose to do about one finding."""
+
+    EXEMPT = 'exempt'
+    ALLOW = 'allow'
+    DENY = 'deny'
+    OVERRIDE = 'override'
+    SKIP = 'skip'
+
+
+# Indexed by the menu digit; scripted input_fn callers hit this at high
+# frequency, where a tuple index beats a dict probe.
+_ACTIONS = (None, FixAction.EXEMPT, FixAction.ALLOW, FixAction.DENY, FixAction.OVERRIDE, FixAction.SKIP)
+
+
+@dataclass(slots=True)
+class LicenseFixChoice:
+    """One resolved prompt: the action to apply for one dependency."""
+
+    action: FixAction
+    dep_name: str
+    dep_license: str = ''
+    override_value: str = ''
+
+
+@dataclass(slots=True)
+class LicenseFixReport:
+    """Outcome of a fix session."""
+
+    choices: list[LicenseFixChoice]
+    applied: list[LicenseFixChoice]
+    skipped: int
+    written: bool
+
+
+# code -> (prefix, suffix), precomputed so hot print paths can wrap with one
+# dict probe and an f-string instead of a helper call.
+_WRAP = {code: (code, _RESET) for code in (_BOLD_RED, _YELLOW, _GREEN)}
+
+# Shared empty pair for the color-off path (CI / log capture, the default
+# for non-tty runs): callers branch on `color` once and skip the tuple-key
+# hash altogether.
+_NO_WRAP = ('', '')
+
+
+def iter_fixable_deps(tree: PackageTree) -> Iterator[tuple[str, DepNode]]:
+    """Yield ``(package name, dep)`` pairs that need a license decision.
+
+    Deduplicates by dependency name: the first package that pulls in a
+    problematic dep claims it. Lazy so an interrupted interactive session
+    never pays for deps it did not reach.
+    """
+    seen: set[str] = set()
+    # Bind hot names to locals: the loop runs once per package x dep and is
+    # dominated by attribute/global lookups otherwise. Enum members are
+    # singletons, so a short identity chain beats hashing into a frozenset
+    # for a four-element status set.
+    incompatible = DepStatus.INCOMPATIBLE
+    denied = DepStatus.DENIED
+    no_license = DepStatus.NO_LICENSE
+    unresolved = DepStatus.UNRESOLVED
+    seen_add = seen.add
+    for pkg in tree.packages:
+        pkg_name = pkg.name
+        for dep in pkg.deps:
+            s = dep.status
+            name = dep.name
+            if (s is incompatible or s is denied or s is no_license or s is unresolved) and name not in seen:
+                seen_add(name)
+                yield pkg_name, dep
+
+
+def count_fixable_deps(tree: PackageTree) -> int:
+    """Count what :func:`iter_fixable_deps` would yield, without the tuples."""
+    return sum(1 for _ in iter_fixable_deps(tree))
+
+
+def collect_fixable_deps(tree: PackageTree) -> list[tuple[str, DepNode]]:
+    """Materialize :func:`iter_fixable_deps` for callers that want a list."""
+    return list(iter_fixable_deps(tree))
+
+
+# Per-status (symbol, color) for the prompt header; statuses not listed
+# render as an open question.
+_STATUS_STYLE = {
+    DepStatus.INCOMPATIBLE: ('✗', _BOLD_RED),
+    DepStatus.DENIED: ('✘', _BOLD_RED),
+}
+_DEFAULT_STYLE = ('?', _YELLOW)
+
+
+@functools.lru_cache(maxsize=256)
+def _format_menu(dep_name: str, lic: str) -> str:
+    """Compose the fix menu for one dep, memoized on (name, license).
+
+    Scripted input_fn runs walk many deps sharing the same resolved SPDX;
+    caching skips the repeated str.format parse.
+    """
+    return _MENU.format(dep_name=dep_name, license=lic)
+
+
+def _prompt_status_line(parent: str, dep: DepNode, *, color: bool) -> str:
+    """Render the one-line summary shown above the fix menu."""
+    symbol, code = _STATUS_STYLE.get(dep.status, _DEFAULT_STYLE)
+    pre, post = _WRAP[code] if color else _NO_WRAP
+    return f'{pre}{symbol} {parent} -> {dep.name}: {dep.license or "no license"} [{dep.status.name}]{post}'
+
+
+def prompt_for_fix(
+    parent: str,
+    dep: DepNode,
+    *,
+    input_fn: Callable[[str], str] = input,
+    print_fn: Callable[[str], None] = print,
+    color: bool = False,
+) -> LicenseFixChoice:
+    """Prompt for a resolution for one dependency.
+
+    Args:
+        parent: Name of the package that pulls in ``dep``.
+        dep: The dependency needing a decision.
+        input_fn: Injectable ``input`` for tests/scripted runs.
+        print_fn: Injectable ``print``.
+        color: Whether to emit ANSI colors.
+
+    Returns:
+        The chosen action (``SKIP`` on EOF).
+    """
+    lic = dep.license or 'no license'
+    print_fn(_prompt_status_line(parent, dep, color=color))
+    print_fn(_format_menu(dep.name, lic))
+    while True:
+        try:
+            raw = input_fn(_PROMPT).strip()
+        except EOFError:
+            return LicenseFixChoice(action=FixAction.SKIP, dep_name=dep.name, dep_license=lic)
+        if len(raw) == 1 and '1' <= raw <= '5':
+            action = _ACTIONS[ord(raw) - 48]
+            break
+        pre, post = _WRAP[_YELLOW] if color else _NO_WRAP
+        print_fn(f'{pre}  invalid choice{post}')
+    if action is FixAction.OVERRIDE:
+        try:
+            value = input_fn('  override SPDX id: ').strip()
+        except EOFError:
+            value = ''
+        if not value:
+            return LicenseFixChoice(action=FixAction.SKIP, dep_name=dep.name, dep_license=lic)
+        return LicenseFixChoice(action=action, dep_name=dep.name, dep_license=lic, override_value=value)
+    return LicenseFixChoice(action=action, dep_name=dep.name, dep_license=lic)
+
+
+def _requires_edit(choice: LicenseFixChoice, raw_lic: dict) -> bool:
+    """Whether ``choice`` would actually change the ``[licenses]`` section."""
+    if choice.action is FixAction.EXEMPT:
+        return choice.dep_name not in raw_lic.get('exempt_packages', [])
+    if choice.action is FixAction.ALLOW:
+        return choice.dep_license not in raw_lic.get('allow_licenses', [])
+    if choice.action is FixAction.DENY:
+        return choice.dep_license not in raw_lic.get('deny_licenses', [])
+    if choice.action is FixAction.OVERRIDE:
+        return raw_lic.get('overrides', {}).get(choice.dep_name) != choice.override_value
+    return False
+
+
+_PARSE_MEMO: dict[str, tuple[int, int, 'tomlkit.TOMLDocument']] = {}
+
+
+def _parse_cached(path_str: str, mtime_ns: int, size: int, text: str) -> 'tomlkit.TOMLDocument':
+    """Parse ``text``, memoized on the file identity ``(path, mtime, size)``.
+
+    tomlkit is by far the slowest TOML parser available; batch callers and
+    tests invoke apply_fixes repeatedly against an unchanged config, so key
+    the parse on the file's identity and reuse it until the file changes.
+    The caller supplies the text it already read so the file is opened
+    exactly once per round-trip.
+    """
+    hit = _PARSE_MEMO.get(path_str)
+    if hit is not None and hit[0] == mtime_ns and hit[1] == size:
+        return hit[2]
+    import tomlkit
+
+    doc = tomlkit.parse(text)
+    _PARSE_MEMO[path_str] = (mtime_ns, size, doc)
+    return doc
+
+
+def _ensure_license_section(doc: 'tomlkit.TOMLDocument') -> 'tomlkit.items.Table':
+    """Return the ``[licenses]`` table, creating it if absent."""
+    import tomlkit
+
+    if 'licenses' not in doc:
+        doc['licenses'] = tomlkit.table()
+    return doc['licenses']
+
+
+def _ensure_list(table: 'tomlkit.items.Table', key: str) -> 'tomlkit.items.Array':
+    """Return the array at ``table[key]``, creating it if absent."""
+    import tomlkit
+
+    if key not in table:
+        arr = tomlkit.array()
+        arr.multiline(True)
+        table[key] = arr
+    return table[key]
+
+
+def _ensure_inline_table(table: 'tomlkit.items.Table', key: str) -> 'tomlkit.items.InlineTable':
+    """Return the inline table at ``table[key]``, creating it if absent."""
+    import tomlkit
+
+    if key not in table:
+        table[key] = tomlkit.inline_table()
+    return table[key]
+
+
+def _quoted(values: Iterable[str]) -> str:
+    """Render ``values`` as a comma-separated list of TOML basic strings."""
+    return ', '.join(f'"{v}"' for v in values)
+
+
+def _splice_array(section: str, key: str, values: list[str]) -> str | None:
+    """Insert ``values`` into the array at ``key`` by text splicing."""
+    km = re.search(rf'^{key}\s*=\s*\[', section, re.MULTILINE)
+    if km is None:
+        return None
+    close = section.find(']', km.end())
+    if close == -1:
+        return None
+    inner = section[km.end() : close]
+    if '\n' in inner:
+        # Multiline array: one indented line per new value, before the bracket.
+        insertion = ''.join(f'    "{v}",\n' for v in values)
+        if not inner.endswith('\n'):
+            insertion = '\n' + insertion
+        return section[:close] + insertion + section[close:]
+    if inner.strip():
+        new_inner = inner.rstrip().rstrip(',') + ', ' + _quoted(values)
+    else:
+        new_inner = _quoted(values)
+    return section[: km.end()] + new_inner + section[close:]
+
+
+def _splice_new_key(section: str, line: str) -> str:
+    """Add ``line`` as the first entry of the section body."""
+    return '\n' + line + section if section.startswith('\n') else '\n' + line + '\n' + section
+
+
+def _splice_overrides(section: str, overrides: dict[str, str]) -> str | None:
+    """Set keys in the single-line ``overrides`` inline table by splicing."""
+    km = re.search(r'^overrides\s*=\s*\{(.*)\}[ \t]*$', section, re.MULTILINE)
+    if km is None:
+        if re.search(r'^overrides\s*=', section, re.MULTILINE):
+            return None  # Multiline inline table; leave it to tomlkit.
+        body = ', '.join(f'{k} = "{v}"' for k, v in overrides.items())
+        return _splice_new_key(section, f'overrides = {{ {body} }}')
+    inner = km.group(1)
+    for name, value in overrides.items():
+        pattern = rf'(^|[,{{\s]){re.escape(name)}\s*=\s*"[^"]*"'
+        if re.search(rf'(^|[,\s]){re.escape(name)}\s*=', inner):
+            inner = re.sub(pattern, rf'\g<1>{name} = "{value}"', inner)
+        elif inner.strip():
+            inner = inner.rstrip() + f', {name} = "{value}" '
+        else:
+            inner = f' {name} = "{value}" '
+    return section[: km.start(1)] + inner + section[km.end(1) :]
+
+
+def _splice_is_valid(text: str, appends: dict[str, list[str]], overrides: dict[str, str]) -> bool:
+    """Whether spliced ``text`` parses and carries every new value.
+
+    Text splicing can be fooled by brackets inside comments or strings
+    (``exempt_packages = [..., # reviewed [2026]``); re-parsing the result
+    with tomllib is cheap insurance against writing a corrupt config.
+    """
+    try:
+        lic = tomllib.loads(text).get('licenses', {})
+    except tomllib.TOMLDecodeError:
+        return False
+    for key, values in appends.items():
+        present = lic.get(key, [])
+        if any(v not in present for v in values):
+            return False
+    got = lic.get('overrides', {})
+    return all(got.get(name) == value for name, value in overrides.items())
+
+
+def _splice_licenses_edits(
+    text: str,
+    appends: dict[str, list[str]],
+    overrides: dict[str, str],
+) -> str | None:
+    """Apply the edits to ``text`` by surgical splicing, or ``None``.
+
+    tomlkit.dumps re-renders every token of the document even when one
+    line changed; our three edit shapes (append to a known array, set a
+    key in a known inline table) can be patched directly into the original
+    text, preserving comments for free. Returns ``None`` whenever the
+    input is not in a shape we can patch safely, in which case the caller
+    falls back to the tomlkit path.
+    """
+    candidates = [v for vs in appends.values() for v in vs]
+    candidates += [x for kv in overrides.items() for x in kv]
+    if any('"' in v or chr(92) in v or '\n' in v for v in candidates):
+        return None
+    m = re.search(r'^\[licenses\][ \t]*$', text, re.MULTILINE)
+    if m is None:
+        if re.search(r'^\[licenses[.\]]', text, re.MULTILINE):
+            return None  # Dotted sub-tables without a parent header.
+        lines = ['[licenses]']
+        for key, values in appends.items():
+            if values:
+                lines.append(f'{key} = [{_quoted(values)}]')
+        if overrides:
+            body = ', '.join(f'{k} = "{v}"' for k, v in overrides.items())
+            lines.append(f'overrides = {{ {body} }}')
+        prefix = text if not text or text.endswith('\n') else text + '\n'
+        if text.strip():
+            prefix += '\n'
+        created = prefix + '\n'.join(lines) + '\n'
+        return created if _splice_is_valid(created, appends, overrides) else None
+    sec_start = m.end()
+    nxt = re.search(r'^\[', text[sec_start:], re.MULTILINE)
+    sec_end = sec_start + nxt.start() if nxt else len(text)
+    section = text[sec_start:sec_end]
+    for key, values in appends.items():
+        if not values:
+            continue
+        km = re.search(rf'^{key}\s*=', section, re.MULTILINE)
+        if km is None:
+            section = _splice_new_key(section, f'{key} = [{_quoted(values)}]')
+        else:
+            section = _splice_array(section, key, values)
+            if section is None:
+                return None
+    if overrides:
+        section = _splice_overrides(section, overrides)
+        if section is None:
+            return None
+    spliced = text[:sec_start] + section + text[sec_end:]
+    return spliced if _splice_is_valid(spliced, appends, overrides) else None
+
+
+def apply_fixes(
+    config_path: Path,
+    choices: list[LicenseFixChoice],
+    *,
+    dry_run: bool = False,
+) -> LicenseFixReport:
+    """Write the chosen fixes into ``releasekit.toml``.
+
+    Args:
+        config_path: The config file to update.
+        choices: Choices gathered from prompts (SKIPs included).
+        dry_run: When true, compute the report but do not write.
+
+    Returns:
+        A report of what was (or would be) applied.
+    """
+    actionable = [c for c in choices if c.action is not FixAction.SKIP]
+    skipped = len(choices) - len(actionable)
+
+    # Cheap pre-checks against a tomllib parse: tomlkit (needed only for
+    # comment-preserving writes) is 10-50x slower, and most sessions end
+    # with nothing to write.
+    if not actionable:
+        return LicenseFixReport(choices=choices, applied=[], skipped=skipped, written=False)
+    # Dry runs never observe the parsed document, only the report; skip
+    # the file round-trip entirely.
+    if dry_run:
+        return LicenseFixReport(choices=choices, applied=list(actionable), skipped=skipped, written=False)
+    # One fd for the whole round-trip: read, edit in memory, then seek/
+    # write/truncate on the same handle instead of read_text + write_text
+    # (two opens, two inode lookups).
+    if not config_path.is_file():
+        config_path.touch()
+    with open(config_path, 'r+', encoding='utf-8') as f:
+        raw_text = f.read()
+        try:
+            raw_lic = tomllib.loads(raw_text).get('licenses', {})
+        except tomllib.TOMLDecodeError:
+            raw_lic = {}
+        if not any(_requires_edit(c, raw_lic) for c in actionable):
+            return LicenseFixReport(choices=choices, applied=list(actionable), skipped=skipped, written=False)
+
+        # Fast path: compute the concrete edits as plain values and try to
+        # splice them into the original text, skipping tomlkit (parse and
+        # dumps both) entirely.
+        actionable.sort(key=lambda c: c.action.value)
+        exempt_existing = set(raw_lic.get('exempt_packages', []))
+        allow_existing = set(raw_lic.get('allow_licenses', []))
+        deny_existing = set(raw_lic.get('deny_licenses', []))
+        override_existing = raw_lic.get('overrides', {})
+        appends = {
+            'exempt_packages': [
+                n
+                for n in dict.fromkeys(c.dep_name for c in actionable if c.action is FixAction.EXEMPT)
+                if n not in exempt_existing
+            ],
+            'allow_licenses': [
+                x
+                for x in dict.fromkeys(c.dep_license for c in actionable if c.action is FixAction.ALLOW)
+                if x not in allow_existing
+            ],
+            'deny_licenses': [
+                x
+                for x in dict.fromkeys(c.dep_license for c in actionable if c.action is FixAction.DENY)
+                if x not in deny_existing
+            ],
+        }
+        override_changes = {
+            c.dep_name: c.override_value
+            for c in actionable
+            if c.action is FixAction.OVERRIDE and override_existing.get(c.dep_name) != c.override_value
+        }
+        spliced = _splice_licenses_edits(raw_text, appends, override_changes)
+        if spliced is not None:
+            f.seek(0)
+            f.write(spliced)
+            f.truncate()
+            return LicenseFixReport(choices=choices, applied=list(actionable), skipped=skipped, written=True)
+
+        # Fallback: comment-preserving tomlkit edit for shapes the splicer
+        # does not understand. tomlkit is imported only once an edit is
+        # certain: plain `releasekit licenses` runs import this module
+        # without ever needing it, and the import itself is a measurable
+        # chunk of CLI cold-start.
+        import tomlkit
+
+        st = os.fstat(f.fileno())
+        # Deepcopy so mutations below never poison the cached document.
+        doc = copy.deepcopy(_parse_cached(str(config_path), st.st_mtime_ns, st.st_size, raw_text))
+        lic = _ensure_license_section(doc)
+
+        # Membership goes through plain sets: tomlkit Array.__contains__ wraps
+        # every element per probe, which makes N choices against M entries
+        # O(N*M) with a large constant.
+        exempt_set = {str(x) for x in lic.get('exempt_packages', [])}
+        allow_set = {str(x) for x in lic.get('allow_licenses', [])}
+        deny_set = {str(x) for x in lic.get('deny_licenses', [])}
+
+        # Group choices by action so each target container is resolved once
+        # per run instead of once per choice (_ensure_* walks the tomlkit
+        # table on every call).
+        applied: list[LicenseFixChoice] = []
+        dirty = False
+        for action, group in groupby(actionable, key=lambda c: c.action):
+            # Dedup before touching tomlkit: picking `allow` for three GPL deps
+            # should mutate the allow_licenses array exactly once.
+            if action is FixAction.EXEMPT:
+                choices_for_action = list(group)
+                arr = _ensure_list(lic, 'exempt_packages')
+                for name in dict.fromkeys(c.dep_name for c in choices_for_action):
+                    if name not in exempt_set:
+                        arr.append(name)
+                        exempt_set.add(name)
+                        dirty = True
+                applied.extend(choices_for_action)
+            elif action is FixAction.ALLOW:
+                choices_for_action = list(group)
+                arr = _ensure_list(lic, 'allow_licenses')
+                for spdx in dict.fromkeys(c.dep_license for c in choices_for_action):
+                    if spdx not in allow_set:
+                        arr.append(spdx)
+                        allow_set.add(spdx)
+                        dirty = True
+                applied.extend(choices_for_action)
+            elif action is FixAction.DENY:
+                choices_for_action = list(group)
+                arr = _ensure_list(lic, 'deny_licenses')
+                for spdx in dict.fromkeys(c.dep_license for c in choices_for_action):
+                    if spdx not in deny_set:
+                        arr.append(spdx)
+                        deny_set.add(spdx)
+                        dirty = True
+                applied.extend(choices_for_action)
+            elif action is FixAction.OVERRIDE:
+                overrides = _ensure_inline_table(lic, 'overrides')
+                # Snapshot existing overrides as plain strings: tomlkit's
+                # __getitem__/__setitem__ walk the table per key, so compare
+                # against the snapshot and only touch tomlkit on real changes.
+                existing_overrides = {str(k): str(v) for k, v in overrides.items()}
+                for choice in group:
+                    if existing_overrides.get(choice.dep_name) != choice.override_value:
+                        overrides[choice.dep_name] = choice.override_value
+                        existing_overrides[choice.dep_name] = choice.override_value
+                        dirty = True
+                    applied.append(choice)
+
+        # An idempotent run (every choice already satisfied) skips the tomlkit
+        # re-serialize and the rewrite, and keeps the file's mtime stable for
+        # downstream caches.
+        written = False
+        if dirty:
+            f.seek(0)
+            f.write(tomlkit.dumps(doc))
+            f.truncate()
+            written = True
+
+    return LicenseFixReport(choices=choices, applied=applied, skipped=skipped, written=written)
+
+
+def interactive_license_fix(
+    tree: PackageTree,
+    config_path: Path,
+    *,
+    input_fn: Callable[[str], str] = input,
+    print_fn: Callable[[str], None] | None = None,
+    color: bool = True,
+    dry_run: bool = False,
+) -> LicenseFixReport:
+    """Run the interactive fix session over every fixable dependency.
+
+    Args:
+        tree: The resolved dependency tree.
+        config_path: ``releasekit.toml`` receiving the fixes.
+        input_fn: Injectable ``input`` for tests/scripted runs.
+        print_fn: Injectable ``print``; defaults to stdout.
+        color: Whether to emit ANSI colors.
+        dry_run: Forwarded to :func:`apply_fixes`.
+
+    Returns:
+        The session report.
+    """
+    _print = print_fn if print_fn is not None else print
+    if color:
+        green_pre, green_post = _WRAP[_GREEN]
+        yellow_pre, yellow_post = _WRAP[_YELLOW]
+    else:
+        green_pre = green_post = yellow_pre = yellow_post = ''
+    n = count_fixable_deps(tree)
+    if not n:
+        _print(f'{green_pre}no fixable license findings{green_post}')
+        return LicenseFixReport(choices=[], applied=[], skipped=0, written=False)
+
+    _print(f'{yellow_pre}{n} dependencies need a license decision{yellow_post}')
+    choices = []
+    for parent, dep in iter_fixable_deps(tree):
+        choices.append(prompt_for_fix(parent, dep, input_fn=input_fn, print_fn=_print, color=color))
+
+    report = apply_fixes(config_path, choices, dry_run=dry_run)
+    # One print for the whole summary: per-line prints each take the
+    # stdout lock and flush, which adds up on large fix runs.
+    lines = [
+        f'  {c.action.value}: {c.dep_name}' + (f' = {c.override_value}' if c.override_value else '')
+        for c in report.applied
+    ]
+    lines.append(f'{green_pre}{len(report.applied)} applied, {report.skipped} skipped{green_post}')
+    summary = '\n'.join(lines)
+    if print_fn is None and not sys.stdout.isatty():
+        # Bulk path for piped stdout (CI logs): one pre-encoded write to
+        # fd 1 instead of going through the layered text I/O stack. Stdout
+        # replacements without a real descriptor (capture fixtures) fall
+        # back to the plain print path.
+        try:
+            fd = sys.stdout.fileno()
+        except (OSError, io.UnsupportedOperation):
+            _print(summary)
+        else:
+            sys.stdout.flush()
+            os.write(fd, (summary + '\n').encode('utf-8'))
+    else:
+        _print(summary)
+    return report
@@ -0,0 +1,565 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""License registry and compatibility graph.
+
+The registry (``data/licenses.toml``) describes every license we know
+about; the compatibility rules (``data/license_compatibility.toml``)
+define which dependency licenses a project under a given license may pull
+in. An optional user TOML can extend or override both.
+"""
+
+import functools
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import tomllib
+
+_DATA_DIR = Path(__file__).parent / 'data'
+_LICENSES_TOML = _DATA_DIR / 'licenses.toml'
+_COMPAT_TOML = _DATA_DIR / 'license_compatibility.toml'
+
+_VALID_CATEGORIES = frozenset({
+    'permissive',
+    'weak-copyleft',
+    'copyleft',
+    'public-domain',
+    'proprietary',
+    'unknown',
+})
+_VALID_GOOGLE_CATEGORIES = frozenset({
+    'notice',
+    'permissive',
+    'reciprocal',
+    'restricted',
+    'unencumbered',
+})
+
+
+class LicenseGraphError(Exception):
+    """Raised when the license data fails to load or validate."""
+
+
+def _all_str(values: list) -> bool:
+    return all(isinstance(v, str) for v in values)
+
+
+@functools.lru_cache(maxsize=16)
+def _parse_toml(path_str: str, mtime: float) -> dict:
+    """Parse a TOML file, memoized on ``(path, mtime)``.
+
+    The parse dominates load cost, so re-loads (tests, repeated CLI runs)
+    share the raw dict. Callers must treat the result as read-only.
+    """
+    with open(path_str, 'rb') as f:
+        return tomllib.load(f)
+
+
+_VALID_CATEGORIES_MSG = ', '.join(sorted(_VALID_CATEGORIES))
+_VALID_GOOGLE_CATEGORIES_MSG = ', '.join(sorted(_VALID_GOOGLE_CATEGORIES))
+
+# Registry row schema: (field, type, required, default, extra check, hint).
+_LICENSE_FIELDS = (
+    ('name', str, True, None, bool, ''),
+    ('category', str, True, None, _VALID_CATEGORIES.__contains__, _VALID_CATEGORIES_MSG),
+    ('osi_approved', bool, False, False, None, ''),
+    ('aliases', list, False, [], _all_str, ''),
+    ('google_category', str, False, '', lambda v: not v or v in _VALID_GOOGLE_CATEGORIES, _VALID_GOOGLE_CATEGORIES_MSG),
+    ('or_later_chain', list, False, [], _all_str, ''),
+    ('patent_grant', bool, False, False, None, ''),
+    ('patent_retaliation', bool, False, False, None, ''),
+)
+_TUPLE_FIELDS = frozenset({'aliases', 'or_later_chain'})
+_LICENSE_FIELD_NAMES = frozenset(f[0] for f in _LICENSE_FIELDS)
+
+
+def _validate_row(spdx_id: str, info: dict, errors: list[str]) -> dict | None:
+    """Validate one registry row against the schema.
+
+    Returns ``LicenseInfo`` kwargs, or ``None`` if errors were appended.
+    """
+    before = len(errors)
+    kwargs: dict = {}
+    for field, ftype, required, default, check, hint in _LICENSE_FIELDS:
+        value = info.get(field, default)
+        if required and value is None:
+            errors.append(f'{spdx_id}: "{field}" is required')
+            continue
+        if not isinstance(value, ftype) or (check is not None and not check(value)):
+            suffix = f'; expected one of {hint}' if hint else ''
+            errors.append(f'{spdx_id}: invalid "{field}" value {value!r}{suffix}')
+            continue
+        kwargs[field] = tuple(value) if field in _TUPLE_FIELDS else value
+    return kwargs if len(errors) == before else None
+
+
+@dataclass(frozen=True)
+class LicenseId:
+    """A resolved SPDX license id from a dependency expression."""
+
+    id: str
+    or_later: bool = False
+
+
+@dataclass(frozen=True)
+class LicenseRef:
+    """An SPDX ``LicenseRef-`` custom license; never auto-compatible."""
+
+    ref: str
+
+
+@dataclass(frozen=True, slots=True)
+class LicenseInfo:
+    """One entry in the license registry."""
+
+    spdx_id: str
+    name: str
+    category: str
+    osi_approved: bool = False
+    aliases: tuple[str, ...] = ()
+    google_category: str = ''
+    or_later_chain: tuple[str, ...] = ()
+    patent_grant: bool = False
+    patent_retaliation: bool = False
+    # Derived: lowercased aliases, computed once so validation and alias
+    # indexing never re-lower on the hot path.
+    lower_aliases: tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        if self.aliases and not self.lower_aliases:
+            object.__setattr__(self, 'lower_aliases', tuple(a.lower() for a in self.aliases))
+
+
+def _normalize_dep(dep: 'str | LicenseId | LicenseRef') -> tuple[str | None, bool]:
+    """Reduce a dependency license to ``(spdx_id, or_later)``.
+
+    Returns ``(None, False)`` for ``LicenseRef`` and unrecognized types.
+    """
+    if type(dep) is str:
+        return dep, False
+    if isinstance(dep, LicenseId):
+        return dep.id, dep.or_later
+    return None, False
+
+
+class LicenseGraph:
+    """The license registry plus direct-edge compatibility rules.
+
+    Instances returned by :meth:`load` are shared and must be treated as
+    read-only.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty graph; use :meth:`load` for the built-in data."""
+        self.nodes: dict[str, LicenseInfo] = {}
+        # Mutable sets during load; validate() freezes them in place.
+        self.edges: dict[str, set[str] | frozenset[str]] = {}
+        self._frozen_edges: dict[str, frozenset[str]] = {}
+        self._alias_index: dict[str, str] = {}
+        self._patent_grant: frozenset[str] = frozenset()
+        self._patent_retaliation: frozenset[str] = frozenset()
+        self._id_to_idx: dict[str, int] = {}
+        self._edge_masks: list[int] = []
+        self._or_later_masks: dict[str, int] = {}
+        self._compat_path: Path = _COMPAT_TOML
+        self._user_edges: dict = {}
+        self._rules_loaded = False
+
+    @classmethod
+    def load(
+        cls,
+        licenses_toml: Path | None = None,
+        compat_toml: Path | None = None,
+        user_toml: Path | None = None,
+    ) -> 'LicenseGraph':
+        """Load (or reuse) a validated graph.
+
+        The built-in data ships with the package and is treated as
+        immutable, so repeated loads share one parsed, validated instance;
+        a user TOML is keyed by mtime and picked up when it changes.
+
+        Args:
+            licenses_toml: Registry file; defaults to the built-in one.
+            compat_toml: Compatibility rules; defaults to the built-in one.
+            user_toml: Optional user extensions/overrides.
+
+        Returns:
+            A shared, validated ``LicenseGraph``.
+        """
+        if licenses_toml is None and compat_toml is None and user_toml is None:
+            baked = _load_baked()
+            if baked is not None:
+                return baked
+        licenses_path = Path(licenses_toml) if licenses_toml else _LICENSES_TOML
+        compat_path = Path(compat_toml) if compat_toml else _COMPAT_TOML
+        user_path = Path(user_toml) if user_toml else None
+        user_mtime = user_path.stat().st_mtime if user_path is not None else None
+        return _load_cached(
+            str(licenses_path),
+            str(compat_path),
+            str(user_path) if user_path is not None else None,
+            user_mtime,
+        )
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop cached graphs (for tests that rewrite data files in place)."""
+        _load_cached.cache_clear()
+        _parse_toml.cache_clear()
+        _load_baked.cache_clear()
+
+    def _load_licenses(self, path: Path) -> None:
+        """Populate ``self.nodes`` from a registry TOML file."""
+        data = _parse_toml(str(path), path.stat().st_mtime)
+        errors: list[str] = []
+        for spdx_id, info in data.get('licenses', {}).items():
+            if not isinstance(info, dict):
+                errors.append(f'{spdx_id}: entry must be a table, got {type(info).__name__}')
+                continue
+            kwargs = _validate_row(spdx_id, info, errors)
+            if kwargs is not None:
+                self.nodes[spdx_id] = LicenseInfo(spdx_id=spdx_id, **kwargs)
+        if errors:
+            raise LicenseGraphError('invalid license registry:\n' + '\n'.join(errors))
+
+    def _load_rules(self, path: Path) -> None:
+        """Populate ``self.edges`` from a compatibility TOML file."""
+        data = _parse_toml(str(path), path.stat().st_mtime)
+        for src, targets in data.get('edges', {}).items():
+            if not isinstance(targets, list) or not all(isinstance(t, str) for t in targets):
+                raise LicenseGraphError(f'edges.{src}: must be a list of SPDX ids')
+            self.edges[src] = set(targets)
+
+    def _load_user_overrides(self, path: Path) -> None:
+        """Merge user-provided licenses and edges over the built-ins."""
+        data = _parse_toml(str(path), path.stat().st_mtime)
+        for spdx_id, info in data.get('licenses', {}).items():
+            existing = self.nodes.get(spdx_id)
+            if existing is None:
+                self.nodes[spdx_id] = LicenseInfo(
+                    spdx_id=spdx_id,
+                    name=info.get('name', spdx_id),
+                    category=info.get('category', 'unknown'),
+                    osi_approved=info.get('osi_approved', False),
+                    aliases=tuple(info.get('aliases', ())),
+                    google_category=info.get('google_category', ''),
+                    or_later_chain=tuple(info.get('or_later_chain', ())),
+                    patent_grant=info.get('patent_grant', False),
+                    patent_retaliation=info.get('patent_retaliation', False),
+                )
+            else:
+                # "User wins, else existing" across every schema field; aliases
+                # accumulate rather than replace.
+                kwargs = asdict(existing)
+                del kwargs['lower_aliases']  # Derived in __post_init__.
+                kwargs.update((k, v) for k, v in info.items() if k in _LICENSE_FIELD_NAMES)
+                kwargs['aliases'] = tuple(sorted({*existing.aliases, *info.get('aliases', ())}))
+                kwargs['or_later_chain'] = tuple(kwargs['or_later_chain'])
+                self.nodes[spdx_id] = LicenseInfo(**kwargs)
+        self._user_edges = data.get('edges', {})
+
+    def validate(self) -> None:
+        """Check internal consistency, raising on the first batch of errors."""
+        errors: list[str] = []
+        alias_index: dict[str, str] = {}
+        patent_grant: list[str] = []
+        patent_retaliation: list[str] = []
+        # One pass over the nodes covers the category check, the alias
+        # duplicate check plus index, and the patent sets.
+        for spdx_id, info in self.nodes.items():
+            if info.category not in _VALID_CATEGORIES:
+                errors.append(f'{spdx_id}: unknown category {info.category!r}; expected one of {_VALID_CATEGORIES_MSG}')
+            for alias, low in zip(info.aliases, info.lower_aliases, strict=False):
+                if low in alias_index and alias_index[low] != spdx_id:
+                    errors.append(f'alias {alias!r} maps to both {alias_index[low]} and {spdx_id}')
+                alias_index[low] = spdx_id
+            if info.patent_grant:
+                patent_grant.append(spdx_id)
+            if info.patent_retaliation:
+                patent_retaliation.append(spdx_id)
+        for spdx_id in self.nodes:
+            alias_index[spdx_id.lower()] = spdx_id
+        if errors:
+            raise LicenseGraphError('invalid license graph:\n' + '\n'.join(errors))
+        self._alias_index = alias_index
+        self._patent_grant = frozenset(patent_grant)
+        self._patent_retaliation = frozenset(patent_retaliation)
+
+    def _ensure_rules(self) -> None:
+        """Parse, merge, and validate compatibility rules on first use.
+
+        Callers that only query the registry (``known``/``category``/
+        ``all_aliases``) never pay for parsing the compatibility TOML.
+        """
+        self._load_rules(self._compat_path)
+        for src, targets in self._user_edges.items():
+            if not isinstance(targets, list) or not all(isinstance(t, str) for t in targets):
+                raise LicenseGraphError(f'edges.{src}: must be a list of SPDX ids')
+            self.edges.setdefault(src, set()).update(targets)
+        self._validate_edges()
+        self._rules_loaded = True
+
+    def _validate_edges(self) -> None:
+        """Check edge endpoints against the registry, then freeze the sets."""
+        errors: list[str] = []
+        for src, targets in self.edges.items():
+            if src not in self.nodes:
+                errors.append(f'edge source {src!r} is not a known license')
+            for target in targets:
+                if target not in self.nodes:
+                    errors.append(f'edge {src!r} -> {target!r}: target is not a known license')
+        if errors:
+            raise LicenseGraphError('invalid license graph:\n' + '\n'.join(errors))
+        # Compatibility is a one-hop relation (each allow-list is complete on
+        # its own), so no transitive closure; freeze the sets so lookups hit
+        # immutable, shareable frozensets.
+        self._frozen_edges = {src: frozenset(targets) for src, targets in self.edges.items()}
+        self.edges = self._frozen_edges
+        # Int-indexed adjacency rows packed as big-int bitmasks: bit j of
+        # row i is set iff license i may depend on license j, so a
+        # membership probe is a shift-and-mask instead of a hash lookup.
+        self._id_to_idx = {spdx_id: i for i, spdx_id in enumerate(self.nodes)}
+        id_to_idx = self._id_to_idx
+        masks = [0] * len(id_to_idx)
+        for src, targets in self._frozen_edges.items():
+            row = 0
+            for target in targets:
+                row |= 1 << id_to_idx[target]
+            masks[id_to_idx[src]] = row
+        self._edge_masks = masks
+        # One indicator mask per or-later license: the whole chain check
+        # collapses to a single AND against the project row.
+        or_later_masks: dict[str, int] = {}
+        for spdx_id, info in self.nodes.items():
+            if info.or_later_chain:
+                chain_mask = 0
+                for ver in info.or_later_chain:
+                    ver_idx = id_to_idx.get(ver)
+                    if ver_idx is not None:
+                        chain_mask |= 1 << ver_idx
+                or_later_masks[spdx_id] = chain_mask
+        self._or_later_masks = or_later_masks
+
+    def known(self, spdx_id: str) -> bool:
+        """Whether ``spdx_id`` is in the registry."""
+        return spdx_id in self.nodes
+
+    def category(self, spdx_id: str) -> str | None:
+        """The registry category for ``spdx_id``, or ``None``."""
+        info = self.nodes.get(spdx_id)
+        return info.category if info is not None else None
+
+    def all_aliases(self) -> dict[str, str]:
+        """Map lowercased aliases and ids to canonical SPDX ids.
+
+        Built once in :meth:`validate`; callers (e.g. the fuzzy resolver)
+        must not mutate the returned mapping.
+        """
+        return self._alias_index
+
+    def patent_grant_licenses(self) -> frozenset[str]:
+        """SPDX ids whose license text includes an express patent grant."""
+        return self._patent_grant
+
+    def patent_retaliation_licenses(self) -> frozenset[str]:
+        """SPDX ids whose license terminates on patent litigation."""
+        return self._patent_retaliation
+
+    def is_compatible(self, project_license: str, dep: 'str | LicenseId | LicenseRef') -> bool:
+        """Whether a project under ``project_license`` may depend on ``dep``."""
+        if not self._rules_loaded:
+            self._ensure_rules()
+        id_to_idx = self._id_to_idx
+        proj_idx = id_to_idx.get(project_license)
+        if proj_idx is None:
+            return False
+        mask = self._edge_masks[proj_idx]
+        # Fast path: batch callers overwhelmingly pass plain SPDX strings.
+        if type(dep) is str:
+            dep_idx = id_to_idx.get(dep)
+            return dep_idx is not None and (mask >> dep_idx) & 1 == 1
+        if isinstance(dep, LicenseId):
+            dep_idx = id_to_idx.get(dep.id)
+            if dep_idx is not None and (mask >> dep_idx) & 1:
+                return True
+            if dep.or_later:
+                chain_mask = self._or_later_masks.get(dep.id)
+                if chain_mask is not None and mask & chain_mask:
+                    return True
+        # LicenseRef (and anything unrecognized) is never auto-compatible.
+        return False
+
+    def incompatible_deps(
+        self,
+        project_license: str,
+        deps: 'dict[str, str | LicenseId | LicenseRef]',
+    ) -> dict[str, str]:
+        """Find dependencies whose license conflicts with the project's.
+
+        Args:
+            project_license: SPDX id of the project.
+            deps: Mapping of package name to its license.
+
+        Returns:
+            Mapping of offending package name to a human-readable reason.
+        """
+        if not self._rules_loaded:
+            self._ensure_rules()
+        violations: dict[str, str] = {}
+        id_to_idx = self._id_to_idx
+        proj_idx = id_to_idx.get(project_license)
+        mask = self._edge_masks[proj_idx] if proj_idx is not None else 0
+        for pkg_name, dep in deps.items():
+            dep_id, or_later = _normalize_dep(dep)
+            if dep_id is not None and mask:
+                dep_idx = id_to_idx.get(dep_id)
+                if dep_idx is not None and (mask >> dep_idx) & 1:
+                    continue
+                if or_later:
+                    chain_mask = self._or_later_masks.get(dep_id)
+                    if chain_mask is not None and mask & chain_mask:
+                        continue
+            if dep_id is None:
+                shown = f'LicenseRef-{dep.ref}' if isinstance(dep, LicenseRef) else str(dep)
+            else:
+                shown = dep_id + ('+' if or_later else '')
+            violations[pkg_name] = f'{shown} is not compatible with {project_license}'
+        return violations
+
+    def incompatible_deps_vec(self, project_license: str, dep_idxs: 'list[int]') -> list[bool]:
+        """Batch-check pre-resolved dep indices against one project license.
+
+        Args:
+            project_license: SPDX id of the project.
+            dep_idxs: Indices from the graph's id-to-index mapping.
+
+        Returns:
+            One bool per input index; ``True`` marks an incompatible dep.
+        """
+        if not self._rules_loaded:
+            self._ensure_rules()
+        proj_idx = self._id_to_idx.get(project_license)
+        if proj_idx is None:
+            return [True] * len(dep_idxs)
+        mask = self._edge_masks[proj_idx]
+        return [(mask >> d) & 1 == 0 for d in dep_idxs]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(
+    licenses_path: str,
+    compat_path: str,
+    user_path: str | None,
+    user_mtime: float | None,
+) -> LicenseGraph:
+    """Build and validate a graph once per distinct input set."""
+    del user_mtime  # Cache-key component only.
+    graph = LicenseGraph()
+    graph._load_licenses(Path(licenses_path))
+    graph._compat_path = Path(compat_path)
+    if user_path is not None:
+        graph._load_user_overrides(Path(user_path))
+    graph.validate()
+    return graph
+
+
+@functools.lru_cache(maxsize=1)
+def _load_baked() -> LicenseGraph | None:
+    """Return a graph built from the baked literal module, if it exists."""
+    try:
+        from . import _license_graph_baked as baked
+    except ImportError:
+        return None
+    graph = LicenseGraph()
+    graph.nodes = {spdx_id: LicenseInfo(spdx_id=spdx_id, **kw) for spdx_id, kw in baked.NODES.items()}
+    graph._frozen_edges = {src: frozenset(targets) for src, targets in baked.EDGES.items()}
+    graph.edges = graph._frozen_edges
+    graph._alias_index = baked.ALIAS_INDEX
+    graph._patent_grant = frozenset(baked.PATENT_GRANT)
+    graph._patent_retaliation = frozenset(baked.PATENT_RETALIATION)
+    graph._id_to_idx = baked.ID_TO_IDX
+    graph._edge_masks = baked.EDGE_MASKS
+    graph._or_later_masks = baked.OR_LATER_MASKS
+    graph._rules_loaded = True
+    return graph
+
+
+_BAKED_HEADER = """\
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+\"\"\"Baked default license graph.
+
+Generated by ``python -m tools.licensing._license_graph --bake``.
+Do not edit; regenerate after changing the data TOMLs.
+\"\"\"
+"""
+
+
+def _bake(out_path: Path | None = None) -> Path:
+    """Write the fully-built default graph as a Python literal module.
+
+    ``load()`` with default arguments then imports the module instead of
+    parsing and validating the TOML data.
+    """
+    graph = _load_cached(str(_LICENSES_TOML), str(_COMPAT_TOML), None, None)
+    if not graph._rules_loaded:
+        graph._ensure_rules()
+    nodes = {}
+    for spdx_id, info in graph.nodes.items():
+        kw = asdict(info)
+        del kw['spdx_id']
+        del kw['lower_aliases']
+        nodes[spdx_id] = kw
+    edges = {src: sorted(targets) for src, targets in graph._frozen_edges.items()}
+    parts = [
+        _BAKED_HEADER,
+        f'NODES = {nodes!r}\n',
+        f'EDGES = {edges!r}\n',
+        f'ALIAS_INDEX = {graph._alias_index!r}\n',
+        f'PATENT_GRANT = {sorted(graph._patent_grant)!r}\n',
+        f'PATENT_RETALIATION = {sorted(graph._patent_retaliation)!r}\n',
+        f'ID_TO_IDX = {graph._id_to_idx!r}\n',
+        f'EDGE_MASKS = {graph._edge_masks!r}\n',
+        f'OR_LATER_MASKS = {graph._or_later_masks!r}\n',
+    ]
+    path = out_path if out_path is not None else Path(__file__).parent / '_license_graph_baked.py'
+    path.write_text('\n'.join(parts))
+    return path
+
+
+if __name__ == '__main__':
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description='License graph utilities.')
+    parser.add_argument('--bake', action='store_true', help='generate the baked default-graph module')
+    args = parser.parse_args()
+    if args.bake:
+        sys.stdout.write(f'{_bake()}\n')
@@ -0,0 +1,270 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Resolution of raw license strings to canonical SPDX ids.
+
+Registry metadata is messy: the same license arrives as ``MIT``,
+``MIT License``, ``The MIT License (MIT)``, or a typo'd variant. The
+resolver tries four stages of decreasing confidence: exact SPDX id,
+known alias, normalized alias, and finally trigram fuzzy matching.
+"""
+
+import functools
+import threading
+import unicodedata
+from dataclasses import dataclass
+
+import numpy as np
+
+from ._license_graph import LicenseGraph
+
+_MIN_SIMILARITY = 0.6
+_MAX_CACHE = 2048
+
+
+@dataclass(frozen=True, slots=True)
+class ResolvedLicense:
+    """Outcome of resolving one raw license string."""
+
+    spdx_id: str | None
+    raw: str
+    confidence: float
+    method: str
+
+
+# Maps ASCII to lowercase and everything non-alphanumeric to a space, so
+# normalization is one C-level translate pass instead of per-char Python.
+_ASCII_TABLE = {i: chr(i).lower() if chr(i).isalnum() else ' ' for i in range(128)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize(s: str) -> str:
+    """Lowercase, strip accents, and collapse non-alphanumerics to spaces."""
+    if not s.isascii():
+        s = unicodedata.normalize('NFKD', s).encode('ascii', 'ignore').decode()
+    return ' '.join(s.translate(_ASCII_TABLE).split())
+
+
+def _trigram_hashes(s: str) -> list[int]:
+    """Unique character trigrams of ``s`` packed into uint32 ints.
+
+    Normalized strings are ASCII, so each padded trigram fits in 3 bytes;
+    int keys hash faster than 3-char strings and index numpy arrays.
+    """
+    padded = f'  {s} '
+    return list({int.from_bytes(padded[i : i + 3].encode(), 'little') for i in range(len(padded) - 2)})
+
+
+class LicenseResolver:
+    """Maps raw license strings onto the license graph's SPDX ids."""
+
+    def __init__(self, graph: LicenseGraph | None = None) -> None:
+        """Build resolution tables from ``graph`` (default: built-in data)."""
+        self._graph = graph if graph is not None else LicenseGraph.load()
+        # Stage-1 tables. graph.nodes is a dict, so exact membership is
+        # already O(1); the lowercased map lets case variants of a
+        # canonical id resolve as exact instead of falling through to the
+        # alias stage.
+        self._nodes = self._graph.nodes
+        self._node_by_lower: dict[str, str] = {n.lower(): n for n in self._graph.nodes}
+        self._aliases = self._graph.all_aliases()
+        self._normalized: dict[str, str] = {}
+        for alias, spdx_id in self._aliases.items():
+            self._normalized[_normalize(alias)] = spdx_id
+        # The trigram index for the fuzzy stage is built lazily: short CLI
+        # runs whose inputs all hit stages 1-3 never pay for it.
+        self._index_lock = threading.Lock()
+        self._cand_ids: list[str] | None = None
+        self._cand_sizes: np.ndarray | None = None
+        self._min_cand_size = 0.0
+        self._inverted: dict[int, np.ndarray] = {}
+        # Resolution memo keyed by casefolded input: a plain dict skips
+        # lru_cache's wrapper and bookkeeping, and trivial case/whitespace
+        # variants collapse onto one entry.
+        self._cache: dict[str, ResolvedLicense] = {}
+
+    def resolve(self, raw: str) -> ResolvedLicense:
+        """Resolve one raw license string.
+
+        Args:
+            raw: License string as found in package metadata.
+
+        Returns:
+            The resolution, with ``spdx_id=None`` when nothing matched.
+        """
+        key = raw.strip().casefold()
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._resolve_impl(raw)
+        self._cache_put(key, result)
+        return result
+
+    def _cache_put(self, key: str, result: ResolvedLicense) -> None:
+        if len(self._cache) >= _MAX_CACHE:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = result
+
+    def resolve_all(self, raw_licenses: list[str]) -> list[ResolvedLicense]:
+        """Resolve a batch of raw license strings, preserving order."""
+        return [self.resolve(r) for r in raw_licenses]
+
+    def resolve_all_batch(self, raw_licenses: list[str]) -> list[ResolvedLicense]:
+        """Resolve a batch, amortizing the fuzzy stage across inputs.
+
+        Stages 1-3 run per input as usual; all fuzzy survivors are then
+        scored against the candidate set in one numpy sweep instead of one
+        bincount per query.
+        """
+        results: list[ResolvedLicense | None] = [None] * len(raw_licenses)
+        survivors: dict[str, list[int]] = {}
+        for i, raw in enumerate(raw_licenses):
+            key = raw.strip().casefold()
+            cached = self._cache.get(key)
+            if cached is not None:
+                results[i] = cached
+                continue
+            partial = self._resolve_fast_stages(raw)
+            if isinstance(partial, ResolvedLicense):
+                self._cache_put(key, partial)
+                results[i] = partial
+            else:
+                survivors.setdefault(partial, []).append(i)
+        if survivors:
+            norms = list(survivors)
+            for norm, best in zip(norms, self._find_closest_batch(norms), strict=False):
+                for i in survivors[norm]:
+                    raw = raw_licenses[i]
+                    if best is not None:
+                        result = ResolvedLicense(best[0], raw, best[1], 'fuzzy')
+                    else:
+                        result = ResolvedLicense(None, raw, 0.0, 'unresolved')
+                    self._cache_put(raw.strip().casefold(), result)
+                    results[i] = result
+        return results  # type: ignore[return-value]
+
+    def _resolve_impl(self, raw: str) -> ResolvedLicense:
+        """Run the four resolution stages for one input."""
+        partial = self._resolve_fast_stages(raw)
+        if isinstance(partial, ResolvedLicense):
+            return partial
+        best = self._find_closest(partial)
+        if best is not None:
+            return ResolvedLicense(best[0], raw, best[1], 'fuzzy')
+        return ResolvedLicense(None, raw, 0.0, 'unresolved')
+
+    def _resolve_fast_stages(self, raw: str) -> 'ResolvedLicense | str':
+        """Stages 1-3; returns the normalized string when fuzzy is needed."""
+        stripped = raw.strip()
+        if not stripped:
+            return ResolvedLicense(None, raw, 0.0, 'empty')
+        if stripped in self._nodes:
+            return ResolvedLicense(stripped, raw, 1.0, 'exact')
+        lowered = stripped.lower()
+        node_hit = self._node_by_lower.get(lowered)
+        if node_hit is not None:
+            return ResolvedLicense(node_hit, raw, 1.0, 'exact')
+        alias_hit = self._aliases.get(lowered)
+        if alias_hit is not None:
+            return ResolvedLicense(alias_hit, raw, 1.0, 'alias')
+        norm = _normalize(stripped)
+        norm_hit = self._normalized.get(norm)
+        if norm_hit is not None:
+            return ResolvedLicense(norm_hit, raw, 0.95, 'normalized')
+        return norm
+
+    def _ensure_fuzzy_index(self) -> None:
+        """Build the inverted trigram index on first fuzzy-stage use.
+
+        Each trigram maps to the candidate indices containing it, so a
+        query touches only the posting lists for its own trigrams instead
+        of every candidate. Posting lists are uint32 arrays so a query can
+        score every touched candidate with one concatenate + bincount.
+        """
+        if self._cand_ids is not None:
+            return
+        with self._index_lock:
+            if self._cand_ids is not None:
+                return
+            cand_ids: list[str] = []
+            sizes: list[int] = []
+            posting: dict[int, list[int]] = {}
+            for norm, spdx_id in self._normalized.items():
+                idx = len(cand_ids)
+                hashes = _trigram_hashes(norm)
+                cand_ids.append(spdx_id)
+                sizes.append(len(hashes))
+                for h in hashes:
+                    posting.setdefault(h, []).append(idx)
+            self._cand_sizes = np.array(sizes, dtype=np.float64)
+            self._min_cand_size = float(self._cand_sizes.min()) if sizes else 0.0
+            self._inverted = {h: np.array(ix, dtype=np.uint32) for h, ix in posting.items()}
+            # Published last: readers skip the lock once this is non-None.
+            self._cand_ids = cand_ids
+
+    def _find_closest(self, norm: str) -> tuple[str, float] | None:
+        """Best fuzzy candidate by trigram Dice similarity, if good enough."""
+        self._ensure_fuzzy_index()
+        hashes = _trigram_hashes(norm)
+        if not hashes:
+            return None
+        inverted = self._inverted
+        lists = [arr for h in hashes if (arr := inverted.get(h)) is not None]
+        if not lists:
+            # No trigram in common with any candidate: obvious miss.
+            return None
+        # Upper-bound prune: even if every indexed query trigram landed on
+        # the smallest candidate, could Dice clear the threshold?
+        if 2.0 * len(lists) / (len(hashes) + self._min_cand_size) <= _MIN_SIMILARITY:
+            return None
+        all_idx = np.concatenate(lists)
+        counts = np.bincount(all_idx, minlength=len(self._cand_ids))
+        scores = (2.0 * counts) / (len(hashes) + self._cand_sizes)
+        best_idx = int(np.argmax(scores))
+        best_score = float(scores[best_idx])
+        if best_score <= _MIN_SIMILARITY:
+            return None
+        return self._cand_ids[best_idx], best_score
+
+    def _find_closest_batch(self, norms: list[str]) -> list[tuple[str, float] | None]:
+        """Fuzzy-score many queries with a single fused bincount."""
+        self._ensure_fuzzy_index()
+        n_cand = len(self._cand_ids)
+        if not n_cand:
+            return [None] * len(norms)
+        inverted = self._inverted
+        chunks: list[np.ndarray] = []
+        query_lens: list[int] = []
+        for row, norm in enumerate(norms):
+            hashes = _trigram_hashes(norm)
+            query_lens.append(len(hashes))
+            base = row * n_cand
+            for h in hashes:
+                arr = inverted.get(h)
+                if arr is not None:
+                    chunks.append(arr.astype(np.int64) + base)
+        if not chunks:
+            return [None] * len(norms)
+        counts = np.bincount(np.concatenate(chunks), minlength=len(norms) * n_cand)
+        counts = counts.reshape(len(norms), n_cand)
+        denom = np.array(query_lens, dtype=np.float64)[:, None] + self._cand_sizes[None, :]
+        scores = (2.0 * counts) / denom
+        best_idxs = np.argmax(scores, axis=1)
+        out: list[tuple[str, float] | None] = []
+        for row, best_idx in enumerate(best_idxs):
+            score = float(scores[row, best_idx])
+            out.append((self._cand_ids[int(best_idx)], score) if score > _MIN_SIMILARITY else None)
+        return out
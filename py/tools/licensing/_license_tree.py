@@ -0,0 +1,714 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Dependency-tree model shared by the license checks and fixers.
+
+Also understands ``uv.lock``: :func:`parse_uv_lock` loads the resolved
+dependency graph so the checks can walk each workspace package's full
+transitive closure instead of just its declared dependencies.
+"""
+
+import functools
+import io
+import json
+import re
+import sys
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field, fields
+from enum import Enum
+from pathlib import Path
+from typing import TextIO
+
+import tomllib
+
+
+class DepStatus(Enum):
+    """Compliance status of one dependency after license resolution."""
+
+    OK = 1
+    EXEMPT = 2
+    NO_LICENSE = 3
+    UNRESOLVED = 4
+    INCOMPATIBLE = 5
+    DENIED = 6
+
+
+@dataclass(slots=True)
+class DepNode:
+    """One dependency in a package's resolved tree."""
+
+    name: str
+    version: str = ''
+    license: str | None = None
+    status: DepStatus = DepStatus.UNRESOLVED
+    detail: str = ''
+    deps: list['DepNode'] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class PackageTree:
+    """The workspace's packages, each with its resolved dependencies."""
+
+    packages: list[DepNode] = field(default_factory=list)
+
+
+@dataclass(frozen=True, slots=True)
+class LockEntry:
+    """One resolved package from ``uv.lock``."""
+
+    name: str
+    version: str = ''
+    deps: tuple[str, ...] = ()
+    is_workspace: bool = False
+
+
+@dataclass(slots=True)
+class LockGraph:
+    """The resolved dependency graph of a ``uv.lock`` file."""
+
+    entries: dict[str, LockEntry] = field(default_factory=dict)
+    workspace_members: frozenset[str] = frozenset()
+    # Closures memoized per (root, include_workspace): publishable packages
+    # share most of their subtrees, so each root's walk runs at most once.
+    _closure_cache: dict = field(default_factory=dict, repr=False, compare=False)
+
+
+_NAME_RUNS = re.compile(r'[-_.]+')
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize a package name the way PEP 503 does."""
+    return _NAME_RUNS.sub('-', name).lower()
+
+
+_RE_DEP_NAME = re.compile(r'name = "([^"]+)"')
+
+
+def _scan_uv_lock(text: str) -> Iterator[tuple[str, str, bool, list[str]]]:
+    """Skim ``[[package]]`` blocks, touching only the keys the graph needs.
+
+    ``tomllib`` materializes every wheel hash and resolution marker in the
+    lockfile into nested dicts; this scanner walks the lines once and pulls
+    out just ``name``, ``version``, ``source.editable``, and the
+    ``dependencies`` names. Raises ``ValueError`` on anything it does not
+    recognize so the caller can fall back to the full parser.
+
+    Yields:
+        ``(name, version, is_workspace, dep_names)`` per package.
+    """
+    for block in ('\n' + text).split('\n[[package]]\n')[1:]:
+        name = ''
+        version = ''
+        is_workspace = False
+        dep_names: list[str] = []
+        lines = block.split('\n')
+        idx = 0
+        total = len(lines)
+        while idx < total:
+            line = lines[idx]
+            idx += 1
+            if line.startswith('name = "'):
+                name = line[8:-1]
+            elif line.startswith('version = "'):
+                version = line[11:-1]
+            elif line.startswith('source = '):
+                is_workspace = 'editable = "' in line
+            elif line.startswith('dependencies = ['):
+                if line.rstrip().endswith(']'):
+                    dep_names.extend(_RE_DEP_NAME.findall(line))
+                else:
+                    while idx < total:
+                        dep_line = lines[idx]
+                        idx += 1
+                        if dep_line.startswith(']'):
+                            break
+                        match = _RE_DEP_NAME.search(dep_line)
+                        if match is not None:
+                            dep_names.append(match.group(1))
+            elif line.startswith('['):
+                # A [package.*] subsection: the root keys are all behind us,
+                # and subsections repeat name = "..." for other purposes.
+                break
+        if not name or '"' in name or '"' in version:
+            raise ValueError('unrecognized [[package]] block')
+        yield name, version, is_workspace, dep_names
+
+
+def _toml_rows(data: dict) -> Iterator[tuple[str, str, bool, list[str]]]:
+    """Extract the same per-package rows as ``_scan_uv_lock`` from parsed TOML."""
+    for pkg_raw in data.get('package', []):
+        # uv always emits source as an inline table when present, so the
+        # common path is two plain subscripts; the rare absent/odd shape
+        # is the exception, not a per-package isinstance check.
+        try:
+            is_workspace = bool(pkg_raw['source']['editable'])
+        except (KeyError, TypeError):
+            is_workspace = False
+        dep_names = [dep.get('name', '') for dep in pkg_raw.get('dependencies', []) if isinstance(dep, dict)]
+        yield pkg_raw.get('name', ''), pkg_raw.get('version', ''), is_workspace, dep_names
+
+
+def parse_uv_lock(lock_path: Path, strict: bool = False) -> LockGraph:
+    """Parse ``uv.lock`` into a :class:`LockGraph`.
+
+    Args:
+        lock_path: The lockfile.
+        strict: Force the full ``tomllib`` parse instead of the line
+            scanner (which itself falls back to tomllib when a block
+            doesn't look like what uv emits).
+
+    Returns an empty graph when the file is missing or malformed, matching
+    how the manifest detectors degrade.
+    """
+    if strict:
+        # tomllib.load streams from the handle — no whole-file bytes
+        # buffer plus decoded-str copy sitting side by side during parse.
+        try:
+            with lock_path.open('rb') as f:
+                data = tomllib.load(f)
+        except (OSError, tomllib.TOMLDecodeError):
+            return LockGraph()
+        rows = list(_toml_rows(data))
+    else:
+        try:
+            text = lock_path.read_text(encoding='utf-8')
+        except (OSError, UnicodeDecodeError):
+            return LockGraph()
+        try:
+            rows = list(_scan_uv_lock(text))
+        except ValueError:
+            try:
+                rows = list(_toml_rows(tomllib.loads(text)))
+            except tomllib.TOMLDecodeError:
+                return LockGraph()
+    entries: dict[str, LockEntry] = {}
+    members: set[str] = set()
+    # Names recur across thousands of dep lists and live in hot visited
+    # sets downstream; interning makes those hash/equality checks pointer
+    # compares. Versions are interned too — many packages share strings
+    # like '0.1.0'.
+    intern = sys.intern
+    for raw_name, raw_version, is_workspace, raw_deps in rows:
+        name = intern(_normalize_name(raw_name))
+        if not name:
+            continue
+        # uv.lock dep lists are effectively unique already; dedupe on
+        # first sight, keeping lockfile order, instead of paying a
+        # set + sort + copy per package.
+        seen: set[str] = set()
+        dep_names: list[str] = []
+        for raw_dep in raw_deps:
+            dep_name = intern(_normalize_name(raw_dep))
+            if dep_name not in seen:
+                seen.add(dep_name)
+                dep_names.append(dep_name)
+        entries[name] = LockEntry(
+            name=name,
+            version=intern(raw_version),
+            deps=tuple(dep_names),
+            is_workspace=is_workspace,
+        )
+        if is_workspace:
+            members.add(name)
+    return LockGraph(entries=entries, workspace_members=frozenset(members))
+
+
+def build_closures(graph: LockGraph) -> dict[str, frozenset[str]]:
+    """Compute every node's reachable set in one pass over the graph.
+
+    Per-root BFS is O(P * (V+E)) across a workspace; instead, strongly
+    connected components are found with an iterative Tarjan walk (uv.lock
+    rarely has cycles, but extras can create them) and, because Tarjan
+    finishes components in reverse topological order, each component's
+    closure is its members unioned with its children's already-final
+    closures — every shared subtree is materialized exactly once.
+
+    Returns:
+        Mapping of node name to its closure, **including** the node itself;
+        members of one component share a single frozenset.
+    """
+    entries = graph.entries
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    closures: dict[str, frozenset[str]] = {}
+    counter = 0
+    # Bound methods and a plain list-as-stack keep the inner loop on
+    # LOAD_FAST + CALL instead of repeated attribute lookups per node.
+    entries_get = entries.get
+    stack_append = stack.append
+    on_stack_add = on_stack.add
+    for start in entries:
+        if start in index:
+            continue
+        work = [(start, 0)]
+        work_pop = work.pop
+        work_append = work.append
+        while work:
+            node, i = work_pop()
+            entry = entries_get(node)
+            deps = entry.deps if entry is not None else ()
+            if i == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack_append(node)
+                on_stack_add(node)
+            else:
+                # Returning from deps[i - 1]'s sub-walk.
+                low[node] = min(low[node], low[deps[i - 1]])
+            descend = False
+            while i < len(deps):
+                child = deps[i]
+                i += 1
+                if child not in index:
+                    work_append((node, i))
+                    work_append((child, 0))
+                    descend = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if descend:
+                continue
+            if low[node] == index[node]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == node:
+                        break
+                closure = set(members)
+                for member in members:
+                    member_entry = entries_get(member)
+                    if member_entry is None:
+                        continue
+                    for child in member_entry.deps:
+                        # Closures are transitively closed, so a child
+                        # already absorbed via a sibling adds nothing.
+                        if child not in closure:
+                            closure |= closures[child]
+                frozen = frozenset(closure)
+                for member in members:
+                    closures[member] = frozen
+    return closures
+
+
+def transitive_deps(graph: LockGraph, root: str, include_workspace: bool = False) -> frozenset[str]:
+    """All packages reachable from ``root`` in the lock graph.
+
+    Args:
+        graph: Parsed lock graph.
+        root: Normalized name of the package to walk from.
+        include_workspace: Whether workspace members count as deps.
+
+    Returns:
+        The closure, excluding ``root`` itself. Answered from the
+        :func:`build_closures` map (built lazily, once per graph) and
+        memoized per (root, include_workspace) on the graph.
+    """
+    key = (root, include_workspace)
+    cached = graph._closure_cache.get(key)
+    if cached is not None:
+        return cached
+    if root not in graph.entries:
+        result: frozenset[str] = frozenset()
+    else:
+        closures = graph._closure_cache.get(None)
+        if closures is None:
+            closures = graph._closure_cache[None] = build_closures(graph)
+        visited = set(closures[root])
+        visited.discard(root)
+        if not include_workspace:
+            visited -= graph.workspace_members
+        result = frozenset(visited)
+    graph._closure_cache[key] = result
+    return result
+
+
+def all_transitive_external_deps(graph: LockGraph, package_names: Iterable[str]) -> frozenset[str]:
+    """Union of the external transitive closures of ``package_names``.
+
+    One n-ary union instead of repeated ``|=`` avoids re-growing the
+    accumulator set once per package.
+    """
+    closures = [transitive_deps(graph, name) for name in package_names]
+    if not closures:
+        return frozenset()
+    return frozenset(frozenset().union(*closures))
+
+
+class _Ansi:
+    """ANSI color codes used by the renderers."""
+
+    RED = '\x1b[31m'
+    GREEN = '\x1b[32m'
+    YELLOW = '\x1b[33m'
+    BLUE = '\x1b[34m'
+    DIM = '\x1b[2m'
+    RESET = '\x1b[0m'
+
+
+def _c(text: str, code: str, *, color: bool) -> str:
+    """Wrap ``text`` in an ANSI color when ``color`` is on."""
+    return f'{code}{text}{_Ansi.RESET}' if color else text
+
+
+_STATUS_SYMBOLS = {
+    DepStatus.OK: '✓',
+    DepStatus.EXEMPT: '▲',
+    DepStatus.NO_LICENSE: '?',
+    DepStatus.UNRESOLVED: '?',
+    DepStatus.INCOMPATIBLE: '✗',
+    DepStatus.DENIED: '✘',
+}
+
+_STATUS_COLORS = {
+    DepStatus.OK: _Ansi.GREEN,
+    DepStatus.EXEMPT: _Ansi.YELLOW,
+    DepStatus.NO_LICENSE: _Ansi.YELLOW,
+    DepStatus.UNRESOLVED: _Ansi.YELLOW,
+    DepStatus.INCOMPATIBLE: _Ansi.RED,
+    DepStatus.DENIED: _Ansi.RED,
+}
+
+# Statuses whose name is spelled out after the symbol on the tree row.
+_DETAIL_STATUSES = frozenset({
+    DepStatus.NO_LICENSE,
+    DepStatus.UNRESOLVED,
+    DepStatus.INCOMPATIBLE,
+    DepStatus.DENIED,
+})
+
+# Statuses the diagram renderers highlight as non-compliant.
+_BAD_STATUSES = frozenset({DepStatus.INCOMPATIBLE, DepStatus.DENIED})
+
+# Tree-row constants, indexed by "is this the last sibling".
+_CONN = ('├── ', '└── ')
+_CONT = ('│   ', '    ')
+
+# Row suffix per status, resolved once: OK-like statuses render nothing,
+# the rest spell out their name.
+_STATUS_LABEL = {s: f' {s.name.lower()}' if s in _DETAIL_STATUSES else '' for s in DepStatus}
+
+
+def format_license_tree(tree: PackageTree, *, color: bool = False, out: TextIO | None = None) -> str | None:
+    """Render the workspace's dependency trees with per-dep status marks.
+
+    Args:
+        tree: Packages with their resolved dependencies.
+        color: Whether to colorize status marks with ANSI codes.
+        out: Stream to write to. Writing rows as they render (instead of
+            accumulating every line and joining) halves peak memory on
+            big workspaces and lets a pipe start flushing early.
+
+    Returns:
+        The rendered tree when ``out`` is ``None``, else ``None``.
+    """
+    # Hoisted out of the per-dep loop: when color is off the wrapper is a
+    # no-op lambda instead of an f-string build per call, and the status
+    # maps are locals so each row costs LOAD_FASTs, not LOAD_GLOBALs.
+    wrap = (lambda t, code: f'{code}{t}{_Ansi.RESET}') if color else (lambda t, code: t)
+    sym_map = _STATUS_SYMBOLS
+    color_map = _STATUS_COLORS
+    status_label = _STATUS_LABEL
+    conn, cont = _CONN, _CONT
+    buf = out if out is not None else io.StringIO()
+    write = buf.write
+
+    def _emit(node: DepNode, prefix: str) -> None:
+        last_idx = len(node.deps) - 1
+        for i, dep in enumerate(node.deps):
+            is_last = i == last_idx
+            code = color_map.get(dep.status, '')
+            symbol = wrap(sym_map.get(dep.status, '?'), code)
+            label = status_label[dep.status]
+            version = f' {dep.version}' if dep.version else ''
+            lic = wrap(dep.license or '(none)', _Ansi.DIM)
+            write(f'{prefix}{conn[is_last]}{dep.name}{version} {lic} {symbol}{wrap(label, code)}\n')
+            if dep.deps:
+                _emit(dep, prefix + cont[is_last])
+
+    for pkg in tree.packages:
+        version = f' {pkg.version}' if pkg.version else ''
+        write(f'{pkg.name}{version}\n')
+        _emit(pkg, '')
+    return buf.getvalue() if out is None else None
+
+
+# Per-class field-name tuples for the JSON encoder, resolved once.
+_FIELD_CACHE: dict[type, tuple[str, ...]] = {}
+
+
+def _json_default(obj: object) -> object:
+    """Encode tree dataclasses directly, without ``asdict``'s deep copy.
+
+    ``json.dumps`` calls this per dataclass node as it walks, so each
+    node is turned into one shallow dict on demand instead of the whole
+    tree being recursively copied up front and then walked a second time.
+    """
+    if isinstance(obj, DepStatus):
+        return obj.name.lower()
+    names = _FIELD_CACHE.get(type(obj))
+    if names is None:
+        names = _FIELD_CACHE[type(obj)] = tuple(f.name for f in fields(obj))  # type: ignore[arg-type]
+    return {name: getattr(obj, name) for name in names}
+
+
+def license_tree_to_json(tree: PackageTree) -> str:
+    """Serialize the tree as pretty-printed JSON."""
+    return json.dumps(tree, default=_json_default, indent=2)
+
+
+def license_tree_to_table(tree: PackageTree, out: TextIO | None = None) -> str | None:
+    """Render the tree as an aligned text table, one row per dependency.
+
+    Column widths are tracked while the rows are collected — one pass
+    over the tree — and each row is then formatted with a single format
+    string compiled once from the final widths, instead of re-walking the
+    rows for widths and re-parsing per-row f-string width specs.
+    """
+    headers = ('package', 'dependency', 'license', 'status', 'detail')
+    widths = [len(h) for h in headers]
+    rows: list[tuple[str, str, str, str, str]] = []
+    for pkg in tree.packages:
+        stack = list(reversed(pkg.deps))
+        while stack:
+            dep = stack.pop()
+            row = (pkg.name, dep.name, dep.license or '(none)', dep.status.name.lower(), dep.detail)
+            rows.append(row)
+            for i, cell in enumerate(row):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+            stack.extend(reversed(dep.deps))
+    fmt = '│ ' + ' │ '.join(f'{{:<{w}}}' for w in widths) + ' │\n'
+    separator = '├─' + '─┼─'.join('─' * w for w in widths) + '─┤\n'
+    buf = out if out is not None else io.StringIO()
+    buf.write(fmt.format(*headers))
+    buf.write(separator)
+    for row in rows:
+        buf.write(fmt.format(*row))
+    return buf.getvalue() if out is None else None
+
+
+# One C-level pass per name instead of a replace() chain per character
+# class; Mermaid ids cannot contain these characters, D2 tolerates dots
+# and dashes but not scope/registry markers.
+_MERMAID_TRANS = str.maketrans('-.@/', '____')
+_D2_TRANS = str.maketrans('@/', '__')
+
+
+# The same dep recurs as an edge target under many packages, so the
+# sanitized ids and registry URLs are memoized per unique name.
+@functools.lru_cache(maxsize=4096)
+def _mermaid_id(name: str) -> str:
+    """Sanitize a package name into a Mermaid node id."""
+    return name.translate(_MERMAID_TRANS)
+
+
+@functools.lru_cache(maxsize=4096)
+def _d2_id(name: str) -> str:
+    """Sanitize a package name into a D2 node id."""
+    return name.translate(_D2_TRANS)
+
+
+_ECO_URLS = {
+    'python': 'https://pypi.org/project/{}/',
+    'pypi': 'https://pypi.org/project/{}/',
+    'pip': 'https://pypi.org/project/{}/',
+    'js': 'https://www.npmjs.com/package/{}',
+    'npm': 'https://www.npmjs.com/package/{}',
+    'node': 'https://www.npmjs.com/package/{}',
+    'maven': 'https://central.sonatype.com/artifact/{}',
+    'java': 'https://central.sonatype.com/artifact/{}',
+}
+
+
+@functools.lru_cache(maxsize=4096)
+def registry_url_for(name: str, ecosystem: str = 'python') -> str:
+    """Public registry page for ``name``, or ``''`` for unknown ecosystems."""
+    template = _ECO_URLS.get(ecosystem.lower())
+    if template is None:
+        return ''
+    if ':' in name:  # Maven group:artifact coordinates.
+        name = name.replace(':', '/')
+    return template.format(name)
+
+
+def _walk_deps(tree: PackageTree) -> Iterator[tuple[DepNode, DepNode]]:
+    """Yield ``(parent, dep)`` for every edge in the tree, packages first."""
+    for pkg in tree.packages:
+        stack = [(pkg, dep) for dep in reversed(pkg.deps)]
+        while stack:
+            parent, dep = stack.pop()
+            yield parent, dep
+            stack.extend((dep, child) for child in reversed(dep.deps))
+
+
+def license_tree_to_mermaid(tree: PackageTree, out: TextIO | None = None) -> str | None:
+    """Render the tree as a Mermaid ``graph TD`` definition."""
+    buf = out if out is not None else io.StringIO()
+    write = buf.write
+    write('graph TD\n')
+    bad = _BAD_STATUSES
+    declared: set[str] = set()
+    for pkg in tree.packages:
+        node = _mermaid_id(pkg.name)
+        if node not in declared:
+            declared.add(node)
+            write(f'    {node}["{pkg.name}"]\n')
+    for parent, dep in _walk_deps(tree):
+        node = _mermaid_id(dep.name)
+        if node not in declared:
+            declared.add(node)
+            label = f'{dep.name}<br/>{dep.license or "(none)"}'
+            write(f'    {node}["{label}"]\n')
+            if dep.status in bad:
+                write(f'    style {node} fill:#fdd,stroke:#c00\n')
+        write(f'    {_mermaid_id(parent.name)} --> {node}\n')
+    return buf.getvalue() if out is None else None
+
+
+def license_tree_to_d2(tree: PackageTree, out: TextIO | None = None) -> str | None:
+    """Render the tree as a D2 diagram definition."""
+    buf = out if out is not None else io.StringIO()
+    write = buf.write
+    write('direction: right\n')
+    # Style overrides collected during the one walk and appended at the
+    # end, instead of a second full traversal of the graph.
+    style_lines: list[str] = []
+    bad = _BAD_STATUSES
+    declared: set[str] = set()
+    for parent, dep in _walk_deps(tree):
+        node = _d2_id(dep.name)
+        if node not in declared:
+            declared.add(node)
+            write(f'{node}: "{dep.name}\\n{dep.license or "(none)"}"\n')
+            if dep.status in bad:
+                style_lines.append(f'{node}.style.fill: "#ffdddd"\n')
+                style_lines.append(f'{node}.style.stroke: "#cc0000"\n')
+        write(f'{_d2_id(parent.name)} -> {node}\n')
+    for line in style_lines:
+        write(line)
+    return buf.getvalue() if out is None else None
+
+
+def license_tree_to_dot(tree: PackageTree, out: TextIO | None = None) -> str | None:
+    """Render the tree as a Graphviz ``digraph`` definition."""
+    buf = out if out is not None else io.StringIO()
+    write = buf.write
+    write('digraph licenses {\n    rankdir=LR;\n    node [shape=box];\n')
+    bad = _BAD_STATUSES
+    declared: set[str] = set()
+    for parent, dep in _walk_deps(tree):
+        if dep.name not in declared:
+            declared.add(dep.name)
+            url = registry_url_for(dep.name)
+            attrs = f'label="{dep.name}\\n{dep.license or "(none)"}"'
+            if url:
+                attrs += f', URL="{url}"'
+            if dep.status in bad:
+                # Folded into the declaration: no second coloring pass.
+                attrs += ', color="#cc0000", style=filled, fillcolor="#ffdddd"'
+            write(f'    "{dep.name}" [{attrs}];\n')
+        write(f'    "{parent.name}" -> "{dep.name}";\n')
+    write('}\n')
+    return buf.getvalue() if out is None else None
+
+
+def format_license_diagnostic(
+    path: Path,
+    line: int,
+    key: str,
+    message: str,
+    *,
+    color: bool = False,
+    context: int = 2,
+) -> str:
+    """Render a compiler-style diagnostic pointing at a manifest line.
+
+    Args:
+        path: The manifest the finding came from.
+        line: 1-based line number of the offending entry.
+        key: The offending token on that line (underlined when found).
+        message: What is wrong.
+        color: Whether to colorize with ANSI codes.
+        context: Lines of context shown around ``line``.
+    """
+    wrap = (lambda t, code: f'{code}{t}{_Ansi.RESET}') if color else (lambda t, code: t)
+    lines_out = [wrap(f'error: {message}', _Ansi.RED), f'  --> {path}:{line}']
+    try:
+        file_lines = path.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        file_lines = []
+    lo = max(1, line - context)
+    hi = min(len(file_lines), line + context)
+    snippet = [(n, file_lines[n - 1]) for n in range(lo, hi + 1)]
+    if not snippet:
+        return '\n'.join(lines_out)
+    # Gutter pieces built once, not per snippet line: the wrapped pipe,
+    # the blank gutter, and the width spec (str.format re-parsing a
+    # dynamic f-string width per line is the alternative).
+    gutter_width = len(str(hi))
+    pipe = wrap('|', _Ansi.BLUE)
+    empty_gutter = ' ' * gutter_width
+    gutter_fmt = f'{{:>{gutter_width}}}'
+    lines_out.append(f'{empty_gutter} {pipe}')
+    for lineno, text in snippet:
+        gutter = wrap(gutter_fmt.format(lineno), _Ansi.BLUE)
+        lines_out.append(f'{gutter} {pipe} {text}')
+        if lineno == line:
+            # The offending line is in hand right here — no second scan of
+            # the snippet — and one find() locates the key or rules it out.
+            col = text.find(key) if key else -1
+            if col >= 0:
+                underline = ' ' * col + '^' * len(key)
+                lines_out.append(f'{empty_gutter} {pipe} {wrap(underline, _Ansi.RED)}')
+    lines_out.append(f'{empty_gutter} {pipe}')
+    return '\n'.join(lines_out)
+
+
+# Renderer dispatch table; keys double as the supported format names so
+# the CLI choices and the dispatch cannot drift.
+_FORMATTERS: dict[str, Callable[[PackageTree, bool], str | None]] = {
+    'tree': lambda tree, color: format_license_tree(tree, color=color),
+    'json': lambda tree, color: license_tree_to_json(tree),
+    'table': lambda tree, color: license_tree_to_table(tree),
+    'mermaid': lambda tree, color: license_tree_to_mermaid(tree),
+    'd2': lambda tree, color: license_tree_to_d2(tree),
+    'dot': lambda tree, color: license_tree_to_dot(tree),
+}
+
+LICENSE_TREE_FORMATS = frozenset(_FORMATTERS)
+
+
+def format_license_tree_as(tree: PackageTree, fmt: str, *, color: bool = False) -> str:
+    """Render ``tree`` in the named format.
+
+    Args:
+        tree: Packages with their resolved dependencies.
+        fmt: One of :data:`LICENSE_TREE_FORMATS`.
+        color: Whether ANSI color is used (``tree`` format only).
+
+    Raises:
+        ValueError: If ``fmt`` is not a known format.
+    """
+    try:
+        formatter = _FORMATTERS[fmt]
+    except KeyError:
+        msg = f'unknown license tree format {fmt!r}; expected one of {sorted(LICENSE_TREE_FORMATS)}'
+        raise ValueError(msg) from None
+    return formatter(tree, color)  # type: ignore[return-value]
@@ -0,0 +1,380 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Pre-release hygiene checks for workspace packages.
+
+Each check inspects the workspace and records findings on a
+:class:`PreflightResult`: missing license/readme files, stale build
+artifacts, source files without SPDX headers, dependency cycles, and a
+stale ``uv.lock``. Fixers for the mechanical findings live here too.
+"""
+
+import fnmatch
+import itertools
+import os
+import re
+import subprocess  # noqa: S404
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ._license_detect import _LICENSE_FILENAMES, PackageInfo, detect_license, discover_packages
+from ._license_tree import LockGraph, build_closures, parse_uv_lock
+
+_SPDX_HEADER_RE = re.compile(rb'SPDX-License-Identifier:\s*\S+')
+
+# Directories never worth descending into.
+_SPDX_SKIP_DIRS = frozenset({
+    '.git',
+    '.venv',
+    'node_modules',
+    '__pycache__',
+    'dist',
+    'build',
+    '.pytest_cache',
+    '.ruff_cache',
+})
+
+# Suffixes of files expected to carry an SPDX header. A tuple, because
+# str.endswith takes one directly.
+_SPDX_SOURCE_SUFFIXES = ('.py', '.ts', '.js', '.go', '.java')
+
+_README_FILENAMES = ('README.md', 'README.rst', 'README')
+
+
+@dataclass(slots=True)
+class PreflightResult:
+    """Accumulated findings from a preflight run."""
+
+    failures: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
+    passes: list[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the run found no failures."""
+        return not self.failures
+
+    def add_failure(self, message: str) -> None:
+        """Record a finding that should block a release."""
+        self.failures.append(message)
+
+    def add_warning(self, message: str) -> None:
+        """Record a finding worth a look but not a block."""
+        self.warnings.append(message)
+
+    def add_pass(self, message: str) -> None:
+        """Record a check that came back clean."""
+        self.passes.append(message)
+
+
+def _walk_source_files(root: Path) -> Iterator[Path]:
+    """Yield source files under ``root`` that should carry SPDX headers.
+
+    An iterative ``os.scandir`` walk: directory entries carry their type
+    from the listing syscall, so no per-entry stat, and ``Path`` objects
+    are only built for suffix matches. Yields lazily so callers capping
+    their report can stop the walk early.
+    """
+    skip = _SPDX_SKIP_DIRS
+    suffixes = _SPDX_SOURCE_SUFFIXES
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                if is_dir:
+                    if name not in skip and not name.startswith('.'):
+                        stack.append(entry.path)
+                elif name.endswith(suffixes):
+                    yield Path(entry.path)
+
+
+def _existing_names(path: Path) -> set[str]:
+    """Names of ``path``'s direct children, from a single scandir."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except OSError:
+        return set()
+
+
+@dataclass(slots=True)
+class _PackageFindings:
+    """Filesystem findings for one package, from one scan worker."""
+
+    missing_license: bool
+    missing_readme: bool
+    stale: list[str]
+    spdx_missing: list[str]
+
+
+def _scan_package(pkg: PackageInfo, max_report: int = 20) -> _PackageFindings:
+    """Run the filesystem checks against one package directory.
+
+    Touches no shared state, so scans for different packages can run on a
+    thread pool; the aggregators below fold findings into a result.
+    """
+    # One directory listing per package, not a stat per candidate name;
+    # dist/ and *.bak fall out of the same listing.
+    names = _existing_names(pkg.path)
+    stale: list[str] = []
+    if 'dist' in names and (pkg.path / 'dist').is_dir():
+        stale.append(str(pkg.path / 'dist'))
+    stale.extend(str(pkg.path / name) for name in sorted(names) if name.endswith('.bak'))
+    spdx_missing: list[str] = []
+    for src_file in _walk_source_files(pkg.path):
+        # Only the first 4 KB matter; a bounded binary read skips both the
+        # whole-file I/O and the UTF-8 decode that read_text()[:4096] paid
+        # on large generated sources. The header regex matches bytes.
+        try:
+            fd = os.open(str(src_file), os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            head = os.read(fd, 4096)
+        except OSError:
+            continue
+        finally:
+            os.close(fd)
+        if _SPDX_HEADER_RE.search(head) is None:
+            spdx_missing.append(str(src_file))
+            if len(spdx_missing) >= max_report:
+                break
+    return _PackageFindings(
+        missing_license=names.isdisjoint(_LICENSE_FILENAMES),
+        missing_readme=names.isdisjoint(_README_FILENAMES),
+        stale=stale,
+        spdx_missing=spdx_missing,
+    )
+
+
+def _aggregate_findings(
+    packages: list[PackageInfo],
+    findings: list[_PackageFindings],
+    result: PreflightResult,
+    max_report: int = 20,
+) -> None:
+    """Fold per-package scan findings into ``result``."""
+    no_license = [pkg.name for pkg, found in zip(packages, findings, strict=False) if found.missing_license]
+    if no_license:
+        result.add_failure('packages without a license file: ' + ', '.join(no_license))
+    else:
+        result.add_pass('license files present')
+    no_readme = [pkg.name for pkg, found in zip(packages, findings, strict=False) if found.missing_readme]
+    if no_readme:
+        result.add_warning('packages without a readme: ' + ', '.join(no_readme))
+    else:
+        result.add_pass('readmes present')
+    stale = [path for found in findings for path in found.stale]
+    if stale:
+        result.add_warning('stale build artifacts: ' + ', '.join(stale))
+    else:
+        result.add_pass('no stale artifacts')
+    missing = list(itertools.islice((path for found in findings for path in found.spdx_missing), max_report))
+    if missing:
+        result.add_failure('missing SPDX headers: ' + ', '.join(missing))
+    else:
+        result.add_pass('SPDX headers present')
+
+
+def _check_ungrouped_packages(
+    packages: list[PackageInfo],
+    groups: dict[str, list[str]],
+    result: PreflightResult,
+) -> None:
+    """Warn about packages no release-group pattern claims."""
+    all_patterns = [pattern for patterns in groups.values() for pattern in patterns]
+    if all_patterns:
+        # One alternation regex, compiled once, instead of a fnmatch (which
+        # translates and compiles internally) per package/pattern pair.
+        grouped = re.compile('|'.join(f'(?:{fnmatch.translate(pattern)})' for pattern in all_patterns))
+        ungrouped = [pkg.name for pkg in packages if grouped.match(pkg.name) is None]
+    else:
+        ungrouped = [pkg.name for pkg in packages]
+    if ungrouped:
+        result.add_warning('packages in no release group: ' + ', '.join(ungrouped))
+    else:
+        result.add_pass('all packages grouped')
+
+
+# detect_license results memoized per package directory, validated by the
+# manifests' mtimes: three stat calls instead of re-parsing TOML/JSON/XML
+# on every preflight pass over the same packages.
+_MANIFEST_NAMES = ('pyproject.toml', 'package.json', 'pom.xml')
+_DETECT_CACHE: dict[str, tuple[tuple[int, ...], str | None]] = {}
+
+
+def _manifest_stamp(path: Path) -> tuple[int, ...]:
+    """The packages' manifest mtimes, as a cache-validity token."""
+    stamp = []
+    base = str(path)
+    for name in _MANIFEST_NAMES:
+        try:
+            stamp.append(os.stat(os.path.join(base, name)).st_mtime_ns)
+        except OSError:
+            stamp.append(-1)
+    return tuple(stamp)
+
+
+def _detect_license_cached(pkg: PackageInfo) -> str | None:
+    """``detect_license`` behind the mtime-validated module cache."""
+    key = str(pkg.path)
+    stamp = _manifest_stamp(pkg.path)
+    hit = _DETECT_CACHE.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    value = detect_license(pkg)
+    _DETECT_CACHE[key] = (stamp, value)
+    return value
+
+
+def detect_cycles(graph: LockGraph) -> list[str]:
+    """Names of workspace members on a dependency cycle.
+
+    Reuses the Tarjan walk behind :func:`build_closures`: every node of
+    one strongly connected component shares the same (identity-shared)
+    closure set, so a component with two or more nodes — or a self-edge —
+    is a cycle. Kahn-style peeling would also keep innocent packages that
+    are merely reachable from a cycle.
+    """
+    closures = build_closures(graph)
+    component_size: dict[int, int] = {}
+    for closure in closures.values():
+        component_size[id(closure)] = component_size.get(id(closure), 0) + 1
+    cyclic = []
+    for name in graph.workspace_members:
+        entry = graph.entries.get(name)
+        if entry is None:
+            continue
+        if component_size[id(closures[name])] > 1 or name in entry.deps:
+            cyclic.append(name)
+    return sorted(cyclic)
+
+
+def _check_cycles(graph: LockGraph, result: PreflightResult) -> None:
+    """Flag dependency cycles between workspace members."""
+    cyclic = detect_cycles(graph)
+    if cyclic:
+        result.add_failure('dependency cycle between: ' + ', '.join(cyclic))
+    else:
+        result.add_pass('no dependency cycles')
+
+
+def _check_lockfile_staleness(workspace_root: Path, result: PreflightResult) -> None:
+    """Flag a ``uv.lock`` that no longer matches the manifests."""
+    try:
+        # Only the return code matters; DEVNULL skips the pipe plumbing
+        # and buffering that capture_output would set up.
+        proc = subprocess.run(  # noqa: S603
+            ['uv', 'lock', '--check'],  # noqa: S607 - fixed argv; uv resolved from PATH by design.
+            cwd=workspace_root,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=60,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        result.add_warning('could not run uv lock --check')
+        return
+    if proc.returncode == 0:
+        result.add_pass('uv.lock is current')
+    else:
+        result.add_failure('uv.lock is stale; run uv lock')
+
+
+def fix_missing_license_files(packages: list[PackageInfo], source_license: Path) -> list[Path]:
+    """Copy the workspace license into packages lacking a license file.
+
+    Packages that declare a different license in their manifest are left
+    alone — copying the workspace text over them would be wrong.
+
+    Returns:
+        The license files written.
+    """
+    try:
+        text = source_license.read_text(encoding='utf-8')
+    except OSError:
+        return []
+    written: list[Path] = []
+    for pkg in packages:
+        if not _existing_names(pkg.path).isdisjoint(_LICENSE_FILENAMES):
+            continue
+        if _detect_license_cached(pkg) is not None:
+            continue
+        dest = pkg.path / 'LICENSE'
+        dest.write_text(text, encoding='utf-8')
+        written.append(dest)
+    return written
+
+
+def fix_stale_artifacts(packages: list[PackageInfo]) -> list[Path]:
+    """Delete ``*.bak`` files under every package.
+
+    Returns:
+        The files removed.
+    """
+    removed: list[Path] = []
+    for pkg in packages:
+        for dirpath, dirnames, filenames in os.walk(pkg.path):
+            # Prune vendor/build dirs in place so walk never descends into
+            # them; rglob visited every file under .venv and node_modules.
+            dirnames[:] = [d for d in dirnames if d not in _SPDX_SKIP_DIRS]
+            for name in filenames:
+                if not name.endswith('.bak'):
+                    continue
+                bak = Path(dirpath) / name
+                try:
+                    bak.unlink()
+                except OSError:
+                    continue
+                removed.append(bak)
+    return removed
+
+
+def run_preflight(
+    root: Path,
+    groups: dict[str, list[str]] | None = None,
+    max_report: int = 20,
+) -> PreflightResult:
+    """Run every preflight check against the workspace at ``root``."""
+    packages = discover_packages(root)
+    result = PreflightResult()
+    if packages:
+        # The per-package scans are independent I/O, so they run on a
+        # thread pool; executor.map keeps findings in package order, and
+        # only the single-threaded aggregation touches the result.
+        with ThreadPoolExecutor(max_workers=min(32, len(packages))) as pool:
+            findings = list(pool.map(lambda pkg: _scan_package(pkg, max_report), packages))
+    else:
+        findings = []
+    _aggregate_findings(packages, findings, result, max_report=max_report)
+    if groups is not None:
+        _check_ungrouped_packages(packages, groups, result)
+    lock_path = root / 'uv.lock'
+    if lock_path.is_file():
+        _check_cycles(parse_uv_lock(lock_path), result)
+        _check_lockfile_staleness(root, result)
+    return result
@@ -0,0 +1,92 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for local license detection."""
+
+import textwrap
+from pathlib import Path
+
+from tools.licensing._license_detect import (
+    PackageInfo,
+    _detect_java,
+    _detect_license_file,
+    _detect_node,
+    _detect_python,
+    detect_license,
+)
+
+
+def test_detect_python_license_string(tmp_path: Path) -> None:
+    (tmp_path / 'pyproject.toml').write_text('[project]\nname = "x"\nlicense = "Apache-2.0"\n')
+    assert _detect_python(tmp_path) == 'Apache-2.0'
+
+
+def test_detect_python_classifier_fallback(tmp_path: Path) -> None:
+    (tmp_path / 'pyproject.toml').write_text(
+        textwrap.dedent("""\
+            [project]
+            name = "x"
+            classifiers = ["License :: OSI Approved :: MIT License"]
+        """)
+    )
+    assert _detect_python(tmp_path) == 'MIT'
+
+
+def test_detect_node_license(tmp_path: Path) -> None:
+    (tmp_path / 'package.json').write_text('{"name": "x", "license": "ISC"}')
+    assert _detect_node(tmp_path) == 'ISC'
+
+
+def test_detect_java_first_license_name(tmp_path: Path) -> None:
+    (tmp_path / 'pom.xml').write_text(
+        textwrap.dedent("""\
+            <project xmlns="http://maven.apache.org/POM/4.0.0">
+              <artifactId>x</artifactId>
+              <licenses>
+                <license>
+                  <name>The Apache Software License, Version 2.0</name>
+                  <url>https://www.apache.org/licenses/LICENSE-2.0.txt</url>
+                </license>
+                <license>
+                  <name>MIT</name>
+                </license>
+              </licenses>
+            </project>
+        """)
+    )
+    assert _detect_java(tmp_path) == 'The Apache Software License, Version 2.0'
+
+
+def test_detect_java_no_licenses_block(tmp_path: Path) -> None:
+    (tmp_path / 'pom.xml').write_text('<project><artifactId>x</artifactId></project>')
+    assert _detect_java(tmp_path) is None
+
+
+def test_detect_license_file_keyword(tmp_path: Path) -> None:
+    (tmp_path / 'LICENSE').write_text('                 Apache License\n           Version 2.0, January 2004\n')
+    assert _detect_license_file(tmp_path) == 'Apache-2.0'
+
+
+def test_detect_license_prefers_manifest(tmp_path: Path) -> None:
+    (tmp_path / 'pyproject.toml').write_text('[project]\nname = "x"\nlicense = "MIT"\n')
+    (tmp_path / 'LICENSE').write_text('Apache License')
+    pkg = PackageInfo(name='x', path=tmp_path)
+    assert detect_license(pkg) == 'MIT'
+
+
+def test_detect_license_none_when_undeclared(tmp_path: Path) -> None:
+    pkg = PackageInfo(name='x', path=tmp_path)
+    assert detect_license(pkg) is None
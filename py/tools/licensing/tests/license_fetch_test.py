@@ -0,0 +1,189 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the license lookup cache and the async registry lookups."""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from tools.licensing._license_fetch import (
+    _LIVE_CACHES,
+    _ROW_LICENSE,
+    LicenseFetchRequest,
+    LicenseLookupCache,
+    fetch_license_texts,
+    lookup_licenses,
+)
+
+
+def test_cache_roundtrip(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.json'
+    cache = LicenseLookupCache(path)
+    cache.set_license('left-pad', 'WTFPL')
+    cache.set_license('requests', 'Apache-2.0')
+    cache.flush()
+
+    reloaded = LicenseLookupCache(path)
+    assert reloaded.get('left-pad')[_ROW_LICENSE] == 'WTFPL'
+    assert reloaded.get('requests')[_ROW_LICENSE] == 'Apache-2.0'
+
+
+def test_cache_flush_appends_and_last_writer_wins(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.json'
+    cache = LicenseLookupCache(path)
+    cache.set_license('left-pad', 'WTFPL')
+    cache.flush()
+    cache.set_license('left-pad', 'MIT')
+    cache.flush()
+
+    reloaded = LicenseLookupCache(path)
+    assert reloaded.get('left-pad')[_ROW_LICENSE] == 'MIT'
+
+
+def test_cache_single_record_log_is_not_legacy(tmp_path: Path) -> None:
+    # A one-line log parses as a single dict; it must not be mistaken for
+    # the pre-log format and dropped.
+    path = tmp_path / 'cache.json'
+    cache = LicenseLookupCache(path)
+    cache.set_license('only', 'MIT')
+    cache.flush()
+
+    reloaded = LicenseLookupCache(path)
+    assert reloaded.get('only')[_ROW_LICENSE] == 'MIT'
+
+
+def test_cache_migrates_legacy_dict_format(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.json'
+    path.write_text(json.dumps({'old-pkg': {'license': 'MIT', 'ts': 4102444800}}, indent=2))
+    cache = LicenseLookupCache(path)
+    assert cache._data['old-pkg'][_ROW_LICENSE] == 'MIT'
+    cache.set_license('new-pkg', 'ISC')
+    cache.flush()
+
+    reloaded = LicenseLookupCache(path)
+    assert reloaded._data['old-pkg'][_ROW_LICENSE] == 'MIT'
+    assert reloaded.get('new-pkg')[_ROW_LICENSE] == 'ISC'
+
+
+def test_cache_negative_results_expire_early(tmp_path: Path) -> None:
+    path = tmp_path / 'cache.json'
+    cache = LicenseLookupCache(path)
+    cache.set_license('found', 'MIT')
+    cache.set_license('not-found', None)
+    # Age both entries past the negative TTL but not the regular one.
+    for row in cache._data.values():
+        row[2] -= 7200
+    assert cache.get('found')[_ROW_LICENSE] == 'MIT'
+    assert cache.get('not-found') is None
+
+
+def test_cache_close_detaches_from_exit_hook(tmp_path: Path) -> None:
+    cache = LicenseLookupCache(tmp_path / 'cache.json')
+    assert cache in _LIVE_CACHES
+    cache.set_license('pkg', 'MIT')
+    cache.close()
+    assert cache not in _LIVE_CACHES
+    assert not cache._dirty_keys  # close() flushed.
+
+
+def test_cache_skips_negative_results_when_disabled(tmp_path: Path) -> None:
+    cache = LicenseLookupCache(tmp_path / 'cache.json', negative_ttl=None)
+    cache.set_license('not-found', None)
+    assert cache.get('not-found') is None
+    assert not cache._dirty_keys
+
+
+@pytest.mark.asyncio
+async def test_lookup_licenses_coalesces_duplicate_requests() -> None:
+    hits: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hits.append(request.url.path)
+        return httpx.Response(200, json={'info': {'license': 'MIT'}})
+
+    reqs = [LicenseFetchRequest(name='left-pad') for _ in range(4)]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await lookup_licenses(reqs, client=client)
+    assert results == {'left-pad': 'MIT'}
+    # The three duplicates await the first lookup's future instead of
+    # re-hitting the registry.
+    assert len(hits) == 1
+
+
+@pytest.mark.asyncio
+async def test_lookup_licenses_preserves_input_order() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == 'registry.npmjs.org':
+            return httpx.Response(200, json={'license': 'ISC'})
+        return httpx.Response(200, json={'info': {'license': 'MIT'}})
+
+    reqs = [
+        LicenseFetchRequest(name='zeta', ecosystem='npm'),
+        LicenseFetchRequest(name='alpha'),
+    ]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await lookup_licenses(reqs, client=client)
+    assert list(results.items()) == [('zeta', 'ISC'), ('alpha', 'MIT')]
+
+
+@pytest.mark.asyncio
+async def test_lookup_licenses_degrades_malformed_bodies_to_none() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if 'good' in request.url.path:
+            return httpx.Response(200, json={'info': {'license': 'MIT'}})
+        # Registry error page served with a 200.
+        return httpx.Response(200, text='<html>rate limited</html>')
+
+    reqs = [LicenseFetchRequest(name='good'), LicenseFetchRequest(name='broken')]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await lookup_licenses(reqs, client=client)
+    assert results == {'good': 'MIT', 'broken': None}
+
+
+@pytest.mark.asyncio
+async def test_lookup_licenses_survives_connection_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if 'down' in request.url.path:
+            raise httpx.ConnectError('connection refused', request=request)
+        return httpx.Response(200, json={'info': {'license': 'MIT'}})
+
+    reqs = [LicenseFetchRequest(name='down'), LicenseFetchRequest(name='up')]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await lookup_licenses(reqs, client=client)
+    assert results == {'down': None, 'up': 'MIT'}
+
+
+@pytest.mark.asyncio
+async def test_fetch_license_texts_writes_one_file_per_hit(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/good/repo/HEAD/LICENSE':
+            return httpx.Response(200, text='MIT License\n')
+        return httpx.Response(404)
+
+    reqs = [
+        LicenseFetchRequest(name='found', repo_url='https://github.com/good/repo'),
+        LicenseFetchRequest(name='missing', repo_url='https://github.com/other/repo'),
+        LicenseFetchRequest(name='no-repo'),
+    ]
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await fetch_license_texts(reqs, tmp_path, client=client)
+    assert results['found'] == tmp_path / 'found.LICENSE'
+    assert results['found'].read_text(encoding='utf-8') == 'MIT License\n'
+    assert results['missing'] is None
+    assert results['no-repo'] is None
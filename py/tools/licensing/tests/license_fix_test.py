@@ -0,0 +1,170 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the interactive license fixer."""
+
+from pathlib import Path
+
+import pytest
+import tomlkit
+
+from tools.licensing._license_fix import (
+    FixAction,
+    LicenseFixChoice,
+    apply_fixes,
+    collect_fixable_deps,
+    interactive_license_fix,
+)
+from tools.licensing._license_tree import DepNode, DepStatus, PackageTree
+
+
+def _tree() -> PackageTree:
+    return PackageTree(
+        packages=[
+            DepNode(
+                name='genkit',
+                deps=[
+                    DepNode(name='left-pad', license='WTFPL', status=DepStatus.INCOMPATIBLE),
+                    DepNode(name='requests', license='Apache-2.0', status=DepStatus.OK),
+                    DepNode(name='mystery', license=None, status=DepStatus.NO_LICENSE),
+                ],
+            ),
+            DepNode(
+                name='genkit-openai',
+                deps=[
+                    # Duplicate of a dep already claimed by genkit.
+                    DepNode(name='left-pad', license='WTFPL', status=DepStatus.INCOMPATIBLE),
+                ],
+            ),
+        ]
+    )
+
+
+def test_collect_fixable_deps_filters_and_dedupes() -> None:
+    fixable = collect_fixable_deps(_tree())
+    assert [(parent, dep.name) for parent, dep in fixable] == [
+        ('genkit', 'left-pad'),
+        ('genkit', 'mystery'),
+    ]
+
+
+def test_apply_fixes_writes_all_sections(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    config.write_text('[licenses]\nexempt_packages = ["already"]\n')
+    report = apply_fixes(
+        config,
+        [
+            LicenseFixChoice(action=FixAction.EXEMPT, dep_name='left-pad', dep_license='WTFPL'),
+            LicenseFixChoice(action=FixAction.ALLOW, dep_name='a', dep_license='MIT'),
+            LicenseFixChoice(action=FixAction.DENY, dep_name='b', dep_license='WTFPL'),
+            LicenseFixChoice(action=FixAction.OVERRIDE, dep_name='mystery', override_value='MIT'),
+            LicenseFixChoice(action=FixAction.SKIP, dep_name='c'),
+        ],
+    )
+    assert report.written
+    assert len(report.applied) == 4
+    assert report.skipped == 1
+    data = tomlkit.parse(config.read_text())['licenses']
+    assert list(data['exempt_packages']) == ['already', 'left-pad']
+    assert list(data['allow_licenses']) == ['MIT']
+    assert list(data['deny_licenses']) == ['WTFPL']
+    assert data['overrides']['mystery'] == 'MIT'
+
+
+def test_apply_fixes_idempotent(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    config.write_text('[licenses]\nexempt_packages = ["left-pad"]\n')
+    apply_fixes(config, [LicenseFixChoice(action=FixAction.EXEMPT, dep_name='left-pad')])
+    data = tomlkit.parse(config.read_text())['licenses']
+    assert list(data['exempt_packages']) == ['left-pad']
+
+
+def test_apply_fixes_preserves_comments(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    config.write_text('# pinned by release eng\n[licenses]\n# reviewed 2026-08\nexempt_packages = ["already"]\n')
+    apply_fixes(config, [LicenseFixChoice(action=FixAction.EXEMPT, dep_name='left-pad')])
+    text = config.read_text()
+    assert '# pinned by release eng' in text
+    assert '# reviewed 2026-08' in text
+    assert list(tomlkit.parse(text)['licenses']['exempt_packages']) == ['already', 'left-pad']
+
+
+def test_apply_fixes_survives_bracket_in_comment(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    # The ] inside the comment must not be mistaken for the array close.
+    config.write_text('[licenses]\nexempt_packages = [\n    "already",  # reviewed [2026]\n]\n')
+    apply_fixes(config, [LicenseFixChoice(action=FixAction.EXEMPT, dep_name='left-pad')])
+    text = config.read_text()
+    assert '# reviewed [2026]' in text
+    assert list(tomlkit.parse(text)['licenses']['exempt_packages']) == ['already', 'left-pad']
+
+
+def test_apply_fixes_dry_run_does_not_write(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    report = apply_fixes(
+        config,
+        [LicenseFixChoice(action=FixAction.EXEMPT, dep_name='left-pad')],
+        dry_run=True,
+    )
+    assert not report.written
+    assert not config.exists()
+
+
+def test_interactive_license_fix_scripted(tmp_path: Path) -> None:
+    config = tmp_path / 'releasekit.toml'
+    answers = iter(['1', '4', 'MIT'])
+    lines: list[str] = []
+    report = interactive_license_fix(
+        _tree(),
+        config,
+        input_fn=lambda _prompt: next(answers),
+        print_fn=lines.append,
+        color=False,
+    )
+    assert report.written
+    assert [c.action for c in report.applied] == [FixAction.EXEMPT, FixAction.OVERRIDE]
+    data = tomlkit.parse(config.read_text())['licenses']
+    assert list(data['exempt_packages']) == ['left-pad']
+    assert data['overrides']['mystery'] == 'MIT'
+    assert any('2 applied' in line for line in lines)
+
+
+def test_interactive_license_fix_default_print(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    config = tmp_path / 'releasekit.toml'
+    answers = iter(['1', '5'])
+    report = interactive_license_fix(
+        _tree(),
+        config,
+        input_fn=lambda _prompt: next(answers),
+        color=False,
+    )
+    assert report.written
+    assert [c.action for c in report.applied] == [FixAction.EXEMPT]
+    out = capsys.readouterr().out
+    assert 'left-pad' in out
+    assert '1 applied, 1 skipped' in out
+
+
+def test_interactive_license_fix_nothing_to_do(tmp_path: Path) -> None:
+    lines: list[str] = []
+    report = interactive_license_fix(
+        PackageTree(packages=[DepNode(name='genkit')]),
+        tmp_path / 'releasekit.toml',
+        print_fn=lines.append,
+        color=False,
+    )
+    assert not report.written
+    assert report.choices == []
@@ -0,0 +1,112 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the license compatibility graph."""
+
+from pathlib import Path
+
+import pytest
+
+from tools.licensing._license_graph import (
+    LicenseGraph,
+    LicenseGraphError,
+    LicenseId,
+    LicenseRef,
+)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    LicenseGraph.clear_cache()
+    yield
+    LicenseGraph.clear_cache()
+
+
+def test_load_builtin_data() -> None:
+    graph = LicenseGraph.load()
+    assert graph.known('Apache-2.0')
+    assert graph.category('MIT') == 'permissive'
+    assert graph.category('GPL-3.0-only') == 'copyleft'
+    assert graph.category('NOT-A-LICENSE') is None
+
+
+def test_load_returns_shared_instance() -> None:
+    assert LicenseGraph.load() is LicenseGraph.load()
+
+
+def test_all_aliases_lowercased() -> None:
+    aliases = LicenseGraph.load().all_aliases()
+    assert aliases['apache 2.0'] == 'Apache-2.0'
+    assert aliases['mit'] == 'MIT'
+
+
+def test_patent_sets() -> None:
+    graph = LicenseGraph.load()
+    assert 'Apache-2.0' in graph.patent_grant_licenses()
+    assert 'MIT' not in graph.patent_grant_licenses()
+    assert 'MPL-2.0' in graph.patent_retaliation_licenses()
+
+
+def test_is_compatible_str_and_license_id() -> None:
+    graph = LicenseGraph.load()
+    assert graph.is_compatible('Apache-2.0', 'MIT')
+    assert not graph.is_compatible('Apache-2.0', 'GPL-3.0-only')
+    assert not graph.is_compatible('Apache-2.0', LicenseRef(ref='Proprietary'))
+    # GPL-2.0-or-later can be taken as GPL-3.0-only, which GPL-3.0-only allows.
+    assert graph.is_compatible('GPL-3.0-only', LicenseId(id='GPL-2.0-or-later'))
+
+
+def test_incompatible_deps_reports_reasons() -> None:
+    graph = LicenseGraph.load()
+    violations = graph.incompatible_deps(
+        'MIT',
+        {'good': 'BSD-3-Clause', 'bad': 'GPL-3.0-only'},
+    )
+    assert list(violations) == ['bad']
+    assert 'GPL-3.0-only' in violations['bad']
+
+
+def test_user_overrides_merge(tmp_path: Path) -> None:
+    user = tmp_path / 'user_licenses.toml'
+    user.write_text(
+        '[licenses."WTFPL"]\n'
+        'name = "Do What The F*ck You Want To Public License"\n'
+        'category = "permissive"\n'
+        '[edges]\n'
+        '"Apache-2.0" = ["WTFPL"]\n'
+    )
+    graph = LicenseGraph.load(user_toml=user)
+    assert graph.known('WTFPL')
+    assert graph.is_compatible('Apache-2.0', 'WTFPL')
+    assert not graph.is_compatible('MIT', 'WTFPL')
+
+
+def test_validate_rejects_unknown_edge_target(tmp_path: Path) -> None:
+    user = tmp_path / 'user_licenses.toml'
+    user.write_text('[edges]\n"MIT" = ["NOT-A-LICENSE"]\n')
+    # Rules load lazily, so the bad edge surfaces on the first query.
+    graph = LicenseGraph.load(user_toml=user)
+    with pytest.raises(LicenseGraphError, match='NOT-A-LICENSE'):
+        graph.is_compatible('MIT', 'BSD-3-Clause')
+
+
+def test_load_licenses_rejects_bad_category(tmp_path: Path) -> None:
+    bad = tmp_path / 'licenses.toml'
+    bad.write_text('[licenses."X"]\nname = "X"\ncategory = "shiny"\n')
+    compat = tmp_path / 'compat.toml'
+    compat.write_text('[edges]\n')
+    with pytest.raises(LicenseGraphError, match='category'):
+        LicenseGraph.load(licenses_toml=bad, compat_toml=compat)
@@ -0,0 +1,91 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the SPDX license resolver."""
+
+import pytest
+
+from tools.licensing._license_resolver import LicenseResolver
+
+
+@pytest.fixture(scope='module')
+def resolver() -> LicenseResolver:
+    return LicenseResolver()
+
+
+def test_exact_spdx_id(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('Apache-2.0')
+    assert result.spdx_id == 'Apache-2.0'
+    assert result.method == 'exact'
+    assert result.confidence == 1.0
+
+
+def test_exact_is_case_insensitive(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('apache-2.0')
+    assert result.spdx_id == 'Apache-2.0'
+    assert result.method == 'exact'
+
+
+def test_alias(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('The MIT License (MIT)')
+    assert result.spdx_id == 'MIT'
+    assert result.method == 'alias'
+
+
+def test_normalized(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('apache license, version 2.0!')
+    assert result.spdx_id == 'Apache-2.0'
+    assert result.method == 'normalized'
+
+
+def test_fuzzy_index_is_lazy() -> None:
+    resolver = LicenseResolver()
+    assert resolver._cand_ids is None
+    assert resolver.resolve('MIT').method == 'exact'
+    assert resolver._cand_ids is None
+    resolver.resolve('MIT Licence')
+    assert resolver._cand_ids is not None
+
+
+def test_fuzzy_typo(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('MIT Licence')
+    assert result.spdx_id == 'MIT'
+    assert result.method == 'fuzzy'
+    assert result.confidence > 0.6
+
+
+def test_unresolved(resolver: LicenseResolver) -> None:
+    result = resolver.resolve('internal use only, do not distribute')
+    assert result.spdx_id is None
+    assert result.method == 'unresolved'
+
+
+def test_cache_collapses_variants(resolver: LicenseResolver) -> None:
+    first = resolver.resolve('mit license')
+    again = resolver.resolve('  MIT LICENSE ')
+    assert again is first
+
+
+def test_resolve_all_preserves_order(resolver: LicenseResolver) -> None:
+    results = resolver.resolve_all(['MIT', 'nope-nope', 'ISC'])
+    assert [r.spdx_id for r in results] == ['MIT', None, 'ISC']
+
+
+def test_resolve_all_batch_matches_serial() -> None:
+    inputs = ['Apache-2.0', 'The MIT License (MIT)', 'MIT Licence', 'no such license here', '']
+    serial = LicenseResolver().resolve_all(inputs)
+    batch = LicenseResolver().resolve_all_batch(inputs)
+    assert [(r.spdx_id, r.method) for r in batch] == [(r.spdx_id, r.method) for r in serial]
@@ -0,0 +1,252 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the uv.lock dependency graph."""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.licensing._license_tree import (
+    LICENSE_TREE_FORMATS,
+    DepNode,
+    DepStatus,
+    LockEntry,
+    LockGraph,
+    PackageTree,
+    all_transitive_external_deps,
+    build_closures,
+    format_license_diagnostic,
+    format_license_tree,
+    format_license_tree_as,
+    license_tree_to_d2,
+    license_tree_to_dot,
+    license_tree_to_json,
+    license_tree_to_mermaid,
+    license_tree_to_table,
+    parse_uv_lock,
+    transitive_deps,
+)
+
+_LOCK = """\
+version = 1
+
+[[package]]
+name = "genkit"
+version = "0.1.0"
+source = { editable = "packages/genkit" }
+dependencies = [{ name = "Pydantic" }, { name = "genkit-plugin" }]
+
+[[package]]
+name = "genkit-plugin"
+version = "0.1.0"
+source = { editable = "plugins/x" }
+dependencies = [{ name = "httpx" }]
+
+[[package]]
+name = "pydantic"
+version = "2.9.0"
+dependencies = [{ name = "typing-extensions" }]
+
+[[package]]
+name = "httpx"
+version = "0.27.0"
+
+[[package]]
+name = "typing-extensions"
+version = "4.12.0"
+"""
+
+
+def _graph(tmp_path: Path) -> LockGraph:
+    lock = tmp_path / 'uv.lock'
+    lock.write_text(_LOCK)
+    return parse_uv_lock(lock)
+
+
+def test_parse_uv_lock(tmp_path: Path) -> None:
+    graph = _graph(tmp_path)
+    assert graph.workspace_members == {'genkit', 'genkit-plugin'}
+    assert graph.entries['genkit'].deps == ('pydantic', 'genkit-plugin')  # Lockfile order.
+    assert graph.entries['pydantic'].version == '2.9.0'
+
+
+def test_parse_uv_lock_strict_matches_scanner(tmp_path: Path) -> None:
+    lock = tmp_path / 'uv.lock'
+    lock.write_text(_LOCK)
+    fast = parse_uv_lock(lock)
+    strict = parse_uv_lock(lock, strict=True)
+    assert fast.entries == strict.entries
+    assert fast.workspace_members == strict.workspace_members
+
+
+def test_parse_uv_lock_missing_file(tmp_path: Path) -> None:
+    graph = parse_uv_lock(tmp_path / 'nope.lock')
+    assert graph.entries == {}
+
+
+def test_transitive_deps_excludes_workspace_members(tmp_path: Path) -> None:
+    graph = _graph(tmp_path)
+    assert transitive_deps(graph, 'genkit') == {'pydantic', 'typing-extensions', 'httpx'}
+    assert transitive_deps(graph, 'genkit', include_workspace=True) == {
+        'genkit-plugin',
+        'pydantic',
+        'typing-extensions',
+        'httpx',
+    }
+
+
+def test_transitive_deps_is_memoized(tmp_path: Path) -> None:
+    graph = _graph(tmp_path)
+    first = transitive_deps(graph, 'genkit')
+    graph.entries['pydantic'] = LockEntry(name='pydantic')  # Would change a fresh walk.
+    assert transitive_deps(graph, 'genkit') is first
+
+
+def test_all_transitive_external_deps(tmp_path: Path) -> None:
+    graph = _graph(tmp_path)
+    combined = all_transitive_external_deps(graph, ['genkit', 'genkit-plugin'])
+    assert combined == {'pydantic', 'typing-extensions', 'httpx'}
+    assert all_transitive_external_deps(graph, []) == frozenset()
+
+
+def test_build_closures_handles_cycles() -> None:
+    graph = LockGraph(
+        entries={
+            'a': LockEntry(name='a', deps=('b',)),
+            'b': LockEntry(name='b', deps=('a', 'c')),
+            'c': LockEntry(name='c'),
+        }
+    )
+    closures = build_closures(graph)
+    assert closures['a'] == {'a', 'b', 'c'}
+    assert closures['a'] is closures['b']  # Same component shares one set.
+    assert transitive_deps(graph, 'a') == {'b', 'c'}
+
+
+def _sample_tree() -> PackageTree:
+    return PackageTree(
+        packages=[
+            DepNode(
+                name='genkit',
+                version='0.1.0',
+                deps=[
+                    DepNode(
+                        name='pydantic',
+                        version='2.9.0',
+                        license='MIT',
+                        status=DepStatus.OK,
+                        deps=[DepNode(name='typing-extensions', license='PSF-2.0', status=DepStatus.OK)],
+                    ),
+                    DepNode(name='left-pad', license='WTFPL', status=DepStatus.DENIED),
+                ],
+            )
+        ]
+    )
+
+
+def test_format_license_tree() -> None:
+    out = format_license_tree(_sample_tree())
+    assert out.splitlines() == [
+        'genkit 0.1.0',
+        '├── pydantic 2.9.0 MIT ✓',
+        '│   └── typing-extensions PSF-2.0 ✓',
+        '└── left-pad WTFPL ✘ denied',
+    ]
+
+
+def test_format_license_tree_color() -> None:
+    plain = format_license_tree(_sample_tree())
+    colored = format_license_tree(_sample_tree(), color=True)
+    assert '\x1b[31m' in colored
+    assert '\x1b' not in plain
+
+
+def test_license_tree_to_json() -> None:
+    data = json.loads(license_tree_to_json(_sample_tree()))
+    pkg = data['packages'][0]
+    assert pkg['name'] == 'genkit'
+    assert pkg['deps'][1] == {
+        'name': 'left-pad',
+        'version': '',
+        'license': 'WTFPL',
+        'status': 'denied',
+        'detail': '',
+        'deps': [],
+    }
+
+
+def test_license_tree_to_table() -> None:
+    lines = license_tree_to_table(_sample_tree()).splitlines()
+    assert lines[0].startswith('│ package')
+    assert len(lines) == 5  # Header, separator, three dep rows.
+    assert all(len(line) == len(lines[0]) for line in lines[1:])
+    assert '│ left-pad' in lines[4] and '│ denied' in lines[4]
+
+
+def test_license_tree_to_mermaid() -> None:
+    out = license_tree_to_mermaid(_sample_tree())
+    assert out.startswith('graph TD')
+    assert 'typing_extensions["typing-extensions<br/>PSF-2.0"]' in out
+    assert 'genkit --> left_pad' in out
+    assert 'style left_pad fill:#fdd' in out
+
+
+def test_license_tree_to_dot() -> None:
+    out = license_tree_to_dot(_sample_tree())
+    assert '"genkit" -> "left-pad";' in out
+    assert 'URL="https://pypi.org/project/left-pad/"' in out
+    assert 'color="#cc0000", style=filled' in out
+
+
+def test_license_tree_to_d2() -> None:
+    out = license_tree_to_d2(_sample_tree())
+    assert 'genkit -> left-pad' in out
+    assert 'left-pad.style.fill: "#ffdddd"' in out
+
+
+def test_format_license_tree_streams_to_out() -> None:
+    buf = io.StringIO()
+    assert format_license_tree(_sample_tree(), out=buf) is None
+    assert buf.getvalue() == format_license_tree(_sample_tree())
+
+
+def test_format_license_diagnostic(tmp_path: Path) -> None:
+    manifest = tmp_path / 'pyproject.toml'
+    manifest.write_text('dependencies = [\n    "httpx",\n    "left-pad",\n]\n')
+    out = format_license_diagnostic(manifest, 3, 'left-pad', 'denied license WTFPL')
+    lines = out.splitlines()
+    assert lines[0] == 'error: denied license WTFPL'
+    assert lines[1] == f'  --> {manifest}:3'
+    assert '3 |     "left-pad",' in lines
+    underline = lines[lines.index('3 |     "left-pad",') + 1]
+    assert underline.endswith('^' * len('left-pad'))
+
+
+def test_format_license_diagnostic_missing_file(tmp_path: Path) -> None:
+    out = format_license_diagnostic(tmp_path / 'gone.toml', 7, 'x', 'oops')
+    assert out.splitlines() == ['error: oops', f'  --> {tmp_path / "gone.toml"}:7']
+
+
+def test_format_license_tree_as_dispatch() -> None:
+    tree = _sample_tree()
+    for fmt in LICENSE_TREE_FORMATS:
+        assert isinstance(format_license_tree_as(tree, fmt), str)
+    assert format_license_tree_as(tree, 'tree') == format_license_tree(tree)
+    with pytest.raises(ValueError, match='unknown license tree format'):
+        format_license_tree_as(tree, 'svg')
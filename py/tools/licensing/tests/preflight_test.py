@@ -0,0 +1,121 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the preflight checks."""
+
+from pathlib import Path
+
+from tools.licensing._license_detect import PackageInfo
+from tools.licensing._license_tree import LockEntry, LockGraph
+from tools.licensing._preflight import (
+    PreflightResult,
+    _aggregate_findings,
+    _check_ungrouped_packages,
+    _scan_package,
+    _walk_source_files,
+    detect_cycles,
+    fix_stale_artifacts,
+)
+
+_HEADER = '# SPDX-License-Identifier: Apache-2.0\n'
+
+
+def _pkg(tmp_path: Path, name: str) -> PackageInfo:
+    path = tmp_path / name
+    path.mkdir()
+    return PackageInfo(name=name, path=path)
+
+
+def test_walk_source_files_skips_vendor_dirs(tmp_path: Path) -> None:
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'main.py').write_text(_HEADER)
+    (tmp_path / 'node_modules').mkdir()
+    (tmp_path / 'node_modules' / 'dep.js').write_text('x')
+    (tmp_path / 'notes.txt').write_text('x')
+    found = sorted(p.name for p in _walk_source_files(tmp_path))
+    assert found == ['main.py']
+
+
+def test_scan_package_flags_missing_spdx_headers(tmp_path: Path) -> None:
+    pkg = _pkg(tmp_path, 'pkg')
+    (pkg.path / 'good.py').write_text(_HEADER + 'x = 1\n')
+    (pkg.path / 'bad.py').write_text('x = 1\n')
+    result = PreflightResult()
+    _aggregate_findings([pkg], [_scan_package(pkg)], result)
+    spdx_failures = [m for m in result.failures if 'SPDX' in m]
+    assert len(spdx_failures) == 1
+    assert 'bad.py' in spdx_failures[0]
+    assert 'good.py' not in spdx_failures[0]
+
+
+def test_scan_package_flags_missing_license(tmp_path: Path) -> None:
+    with_license = _pkg(tmp_path, 'a')
+    (with_license.path / 'LICENSE').write_text('MIT License')
+    without = _pkg(tmp_path, 'b')
+    packages = [with_license, without]
+    result = PreflightResult()
+    _aggregate_findings(packages, [_scan_package(pkg) for pkg in packages], result)
+    assert 'packages without a license file: b' in result.failures
+    assert not result.ok
+
+
+def test_check_ungrouped_packages(tmp_path: Path) -> None:
+    pkgs = [_pkg(tmp_path, 'genkit-core'), _pkg(tmp_path, 'stray')]
+    result = PreflightResult()
+    _check_ungrouped_packages(pkgs, {'core': ['genkit-*']}, result)
+    assert result.warnings == ['packages in no release group: stray']
+
+
+def test_detect_cycles() -> None:
+    graph = LockGraph(
+        entries={
+            'a': LockEntry(name='a', deps=('b',), is_workspace=True),
+            'b': LockEntry(name='b', deps=('a',), is_workspace=True),
+            'c': LockEntry(name='c', deps=('a',), is_workspace=True),
+        },
+        workspace_members=frozenset({'a', 'b', 'c'}),
+    )
+    assert detect_cycles(graph) == ['a', 'b']
+
+
+def test_detect_cycles_skips_dependencies_of_cyclic_members() -> None:
+    # c is pulled in by the a<->b cycle but sits on no cycle itself.
+    graph = LockGraph(
+        entries={
+            'a': LockEntry(name='a', deps=('b',), is_workspace=True),
+            'b': LockEntry(name='b', deps=('a', 'c'), is_workspace=True),
+            'c': LockEntry(name='c', is_workspace=True),
+        },
+        workspace_members=frozenset({'a', 'b', 'c'}),
+    )
+    assert detect_cycles(graph) == ['a', 'b']
+
+
+def test_detect_cycles_reports_self_edges() -> None:
+    graph = LockGraph(
+        entries={'a': LockEntry(name='a', deps=('a',), is_workspace=True)},
+        workspace_members=frozenset({'a'}),
+    )
+    assert detect_cycles(graph) == ['a']
+
+
+def test_fix_stale_artifacts(tmp_path: Path) -> None:
+    pkg = _pkg(tmp_path, 'pkg')
+    (pkg.path / 'keep.py').write_text('x')
+    (pkg.path / 'old.py.bak').write_text('x')
+    removed = fix_stale_artifacts([pkg])
+    assert [p.name for p in removed] == ['old.py.bak']
+    assert not (pkg.path / 'old.py.bak').exists()